@@ -15,11 +15,16 @@ import os
 import sys
 import time
 import glob
+import fcntl
+import ctypes
+import ctypes.util
+import queue
+import select
 import struct
 import threading
 import subprocess
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont, ImageSequence
 from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -30,6 +35,7 @@ W, H = 128, 64
 
 # ===== INPUT =====
 JS_PATH = "/dev/input/js0"
+JS_EVENT = struct.Struct("IhBB")  # js_event: time, value, type, number
 DEADZONE = 12000
 AXIS_X = 0
 AXIS_Y = 1
@@ -111,33 +117,60 @@ def load_font(size: int):
             pass
     return ImageFont.load_default()
 
+# (text, id(font)) -> širina; labeli menija se ponavljaju svaki frame
+_TEXT_W: Dict[Tuple[str, int], int] = {}
+
 def text_width(d: ImageDraw.ImageDraw, text: str, font) -> int:
+    key = (text, id(font))
+    tw = _TEXT_W.get(key)
+    if tw is not None:
+        return tw
     try:
-        return int(d.textlength(text, font=font))
+        tw = int(d.textlength(text, font=font))
     except Exception:
         bbox = d.textbbox((0, 0), text, font=font)
-        return int(bbox[2] - bbox[0])
+        tw = int(bbox[2] - bbox[0])
+    if len(_TEXT_W) < 256:
+        _TEXT_W[key] = tw
+    return tw
+
+# (text, id(font), threshold) -> (maska, bbox left, bbox top); LRU po redu umetanja
+_TEXT_MASKS: Dict[Tuple[str, int, int], Tuple[Image.Image, int, int]] = {}
+TEXT_MASK_CACHE_MAX = 64
+
+def _text_mask(text: str, font, threshold: int) -> Optional[Tuple[Image.Image, int, int]]:
+    key = (text, id(font), threshold)
+    m = _TEXT_MASKS.pop(key, None)
+    if m is None:
+        # maska samo veličine teksta (ne cijeli ekran), threshold jednom
+        l, t, r, b = font.getbbox(text)
+        if r <= l or b <= t:
+            return None
+        mask = Image.new("L", (r - l, b - t), 0)
+        md = ImageDraw.Draw(mask)
+        md.text((-l, -t), text, font=font, fill=255)
+        mask = mask.point(lambda p: 255 if p >= threshold else 0)
+        m = (mask, l, t)
+        if len(_TEXT_MASKS) >= TEXT_MASK_CACHE_MAX:
+            _TEXT_MASKS.pop(next(iter(_TEXT_MASKS)))
+    _TEXT_MASKS[key] = m
+    return m
 
 def draw_text_crisp(img_rgb: Image.Image, pos, text: str, font, fill=(255, 255, 255), threshold: int = 80):
     if not text:
         return
     x, y = pos
-    mask = Image.new("L", (W, H), 0)
-    md = ImageDraw.Draw(mask)
-    md.text((x, y), text, font=font, fill=255)
-    mask = mask.point(lambda p: 255 if p >= threshold else 0)
-
-    layer = Image.new("RGB", (W, H), (0, 0, 0))
-    ld = ImageDraw.Draw(layer)
-    ld.rectangle((0, 0, W, H), fill=fill)
-
-    img_rgb.paste(layer, (0, 0), mask)
+    m = _text_mask(text, font, threshold)
+    if m is None:
+        return
+    mask, l, t = m
+    img_rgb.paste(fill, (x + l, y + t, x + l + mask.width, y + t + mask.height), mask)
 
 def dim_overlay(img_rgb: Image.Image, alpha: int = 155):
-    overlay = Image.new("RGBA", (W, H), (0, 0, 0, alpha))
-    base = img_rgb.convert("RGBA")
-    base.alpha_composite(overlay)
-    img_rgb.paste(base.convert("RGB"))
+    # crni overlay s alfom == množenje svakog kanala s (255-alpha)/255 -> jedan LUT prolaz
+    k = 255 - alpha
+    lut = [(p * k + 127) // 255 for p in range(256)]
+    img_rgb.paste(img_rgb.point(lut * 3))
 
 # =========================
 # LAUNCHER EXIT
@@ -223,49 +256,64 @@ class Js0Reader(threading.Thread):
                 setattr(self._ev, k, getattr(self._ev, k) or v)
             self._ev.any = True
 
+    def _handle_event(self, value: int, etype: int, num: int):
+        if (etype & 0x80) != 0:
+            return
+        et = etype & 0x7F
+
+        if et == 0x02:
+            v = int(value)
+            self._last_axis_ts = time.time()
+
+            if num == AXIS_X:
+                if v < -DEADZONE: self._x_state = -1
+                elif v > DEADZONE: self._x_state = +1
+                else: self._x_state = 0
+
+            elif num == AXIS_Y:
+                if v < -DEADZONE: self._y_state = -1
+                elif v > DEADZONE: self._y_state = +1
+                else: self._y_state = 0
+
+        elif et == 0x01 and value == 1:
+            if num == BTN_START: self._push_btn(start=True)
+            elif num == BTN_SELECT: self._push_btn(select=True)
+            elif num == BTN_A: self._push_btn(a=True)
+            elif num == BTN_B: self._push_btn(b=True)
+            elif num == BTN_X: self._push_btn(x=True)
+            elif num == BTN_Y: self._push_btn(y=True)
+
     def run(self):
         if not os.path.exists(self.js_path):
             return
 
-        fmt = "IhBB"
-        sz = struct.calcsize(fmt)
+        sz = JS_EVENT.size
 
         try:
-            with open(self.js_path, "rb", buffering=0) as f:
-                while not self._stop:
-                    data = f.read(sz)
-                    if not data or len(data) != sz:
-                        time.sleep(0.005)
-                        continue
-
-                    _t, value, etype, num = struct.unpack(fmt, data)
-                    if (etype & 0x80) != 0:
-                        continue
-                    et = etype & 0x7F
-
-                    if et == 0x02:
-                        v = int(value)
-                        self._last_axis_ts = time.time()
-
-                        if num == AXIS_X:
-                            if v < -DEADZONE: self._x_state = -1
-                            elif v > DEADZONE: self._x_state = +1
-                            else: self._x_state = 0
-
-                        elif num == AXIS_Y:
-                            if v < -DEADZONE: self._y_state = -1
-                            elif v > DEADZONE: self._y_state = +1
-                            else: self._y_state = 0
-
-                    elif et == 0x01 and value == 1:
-                        if num == BTN_START: self._push_btn(start=True)
-                        elif num == BTN_SELECT: self._push_btn(select=True)
-                        elif num == BTN_A: self._push_btn(a=True)
-                        elif num == BTN_B: self._push_btn(b=True)
-                        elif num == BTN_X: self._push_btn(x=True)
-                        elif num == BTN_Y: self._push_btn(y=True)
+            fd = os.open(self.js_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return
+
+        try:
+            while not self._stop:
+                # spava u kernelu dok nema eventa (timeout samo radi stop())
+                r, _, _ = select.select([fd], [], [], 0.1)
+                if not r:
+                    continue
+                try:
+                    data = os.read(fd, sz * 64)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    return
+
+                n = len(data) - (len(data) % sz)
+                for _t, value, etype, num in JS_EVENT.iter_unpack(data[:n]):
+                    self._handle_event(value, etype, num)
         except Exception:
             return
+        finally:
+            os.close(fd)
 
 # =========================
 # USB MEDIA DETECTION
@@ -307,40 +355,224 @@ def choose_active_media_dir() -> str:
         return usb
     return LOCAL_MEDIA_DIR
 
+class DirWatcher:
+    """
+    inotify na /media (+ /media/pi, /mnt/usb) i aktivni media folder:
+    kernel javi add/delete fajlova, pa nema slijepog rescana.
+    Mount/umount (i mount preko postojećeg foldera, npr. /mnt/usb) javlja
+    poll() na /proc/self/mountinfo (POLLPRI|POLLERR).
+    Ako inotify nije dostupan, ok == False i main loop ostaje na pollingu.
+    """
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO   = 0x00000080
+    IN_CREATE     = 0x00000100
+    IN_DELETE     = 0x00000200
+    IN_UNMOUNT    = 0x00002000
+    MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_UNMOUNT
+    EVENT = struct.Struct("iIII")  # inotify_event: wd, mask, cookie, len (+ name)
+
+    # bez mountinfo: automount napravi /media/pi/LABEL prije samog mounta,
+    # pa nakon IN_CREATE/IN_UNMOUNT još par sekundi polling na 2 s
+    SETTLE_SEC = 10.0
+
+    def __init__(self):
+        self.fd = -1
+        self._watched = set()
+        self._settle_until = 0.0
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self.fd = fd
+        except Exception:
+            self.fd = -1
+        self._mounts = None
+        self._mpoll = None
+        try:
+            self._mounts = open("/proc/self/mountinfo", "rb")
+            self._mpoll = select.poll()
+            self._mpoll.register(self._mounts, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError):
+            self._mounts = None
+            self._mpoll = None
+
+    @property
+    def ok(self) -> bool:
+        return self.fd >= 0
+
+    def rescan_every(self) -> float:
+        # s inotifyjem rescan samo na event (+ rijetki sigurnosni), inače polling
+        if not self.ok or time.time() < self._settle_until:
+            return 2.0
+        return 30.0
+
+    def watch(self, path: str):
+        if not self.ok or path in self._watched or not os.path.isdir(path):
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd >= 0:
+            self._watched.add(path)
+
+    def changed(self) -> bool:
+        # isprazni sve evente (non-blocking); True ako ih je bilo
+        got = False
+        if self._mpoll is not None and self._mpoll.poll(0):
+            # mount tablica se promijenila; watch na mount pointu gleda stari fs
+            self._watched.clear()
+            got = True
+        if not self.ok:
+            return got
+        mounting = False
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not data:
+                break
+            got = True
+            off = 0
+            while off + self.EVENT.size <= len(data):
+                _wd, mask, _cookie, ln = self.EVENT.unpack_from(data, off)
+                if mask & (self.IN_CREATE | self.IN_UNMOUNT):
+                    mounting = True
+                off += self.EVENT.size + ln
+        if got:
+            # unmountani folderi gube watch -> dozvoli ponovni watch()
+            self._watched = {p for p in self._watched if os.path.isdir(p)}
+        if mounting and self._mpoll is None:
+            self._settle_until = time.time() + self.SETTLE_SEC
+        return got
+
+    def close(self):
+        if self.ok:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = -1
+        if self._mounts is not None:
+            self._mounts.close()
+            self._mounts = None
+            self._mpoll = None
+
 # =========================
 # MEDIA LISTING (VIDEO + GIF ONLY)
 # =========================
 def list_media_files(folder: str) -> List[str]:
-    if not os.path.isdir(folder):
-        return []
+    # scandir: jedan prolaz, is_file() koristi d_type (bez stat po fajlu)
     files = []
-    for p in sorted(glob.glob(os.path.join(folder, "*"))):
-        if not os.path.isfile(p):
-            continue
-        ext = os.path.splitext(p)[1].lower()
-        if ext in GIF_EXT or ext in VIDEO_EXT:
-            files.append(p)
+    try:
+        with os.scandir(folder) as it:
+            for e in it:
+                if e.name.startswith("."):
+                    continue
+                ext = os.path.splitext(e.name)[1].lower()
+                if (ext in GIF_EXT or ext in VIDEO_EXT) and e.is_file():
+                    files.append(e.path)
+    except OSError:
+        return []
+    files.sort()
     return files
 
+def dir_mtime(folder: str) -> float:
+    try:
+        return os.stat(folder).st_mtime
+    except OSError:
+        return 0.0
+
 # =========================
 # VIDEO (ffmpeg)
 # =========================
+# VideoCore H.264 dekoder (RPi) — provjera jednom po pokretanju
+HW_DECODER = "h264_v4l2m2m"
+_hw_decoder_ok: Optional[bool] = None
+
+# ffmpeg već dekodira u svom procesu (druga jezgra); kernel pipe između nas je
+# ring buffer -> povećaj ga na nekoliko frameova da ffmpeg ne čeka na nas
+F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+PIPE_FRAMES = 4
+
+def hw_decoder_available() -> bool:
+    global _hw_decoder_ok
+    if _hw_decoder_ok is None:
+        try:
+            out = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-decoders"],
+                capture_output=True, text=True, timeout=5,
+            ).stdout
+            _hw_decoder_ok = HW_DECODER in out
+        except Exception:
+            _hw_decoder_ok = False
+    return _hw_decoder_ok
+
+# path -> codec prvog video streama; puni ga probe thread, main loop samo čita
+_video_codecs: Dict[str, str] = {}
+_probe_lock = threading.Lock()
+
+def video_codec(path: str) -> str:
+    try:
+        return subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=codec_name", "-of", "csv=p=0", path],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+def probe_video_codecs(paths: List[str]):
+    """ffprobe novih video fajlova u pozadini (meni/picker nikad ne čekaju ffprobe)."""
+    todo = [p for p in paths
+            if p not in _video_codecs and os.path.splitext(p)[1].lower() in VIDEO_EXT]
+    if todo:
+        threading.Thread(target=_probe_loop, args=(todo,), daemon=True).start()
+
+def _probe_loop(paths: List[str]):
+    with _probe_lock:
+        for p in paths:
+            if p not in _video_codecs:
+                _video_codecs[p] = video_codec(p)
+
 class FFMpegVideo:
+    # broj frame buffera koje dijele reader thread i main loop
+    NBUF = 3
+
     def __init__(self, path: str, loop_forever: bool):
         self.path = path
         self.loop_forever = loop_forever
         self.proc: Optional[subprocess.Popen] = None
         self.bufsize = W * H * 3
+        # jedna slika za cijeli video (bez alokacije po frameu)
+        self._img = Image.new("RGB", (W, H), BG)
+        # reader thread puni slobodne buffere, main loop ih vraća nakon prikaza
+        self._free: "queue.Queue[bytearray]" = queue.Queue()
+        self._ready: "queue.Queue[Optional[bytearray]]" = queue.Queue()
+        self._reader: Optional[threading.Thread] = None
+        self._eof = False
+        # HW decode samo za H.264 i samo ako ga ffmpeg ima; codec još neproban -> probaj HW,
+        # ako ne da ni jedan frame -> SW
+        self.use_hw = hw_decoder_available() and _video_codecs.get(path, "h264") == "h264"
+        self._frames = 0
 
     def open(self) -> bool:
         # PLAY ALL -> no looping (EOF -> next file)
         # LOOP ONE -> loop forever
         cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
+        # bez ulaznog bufferiranja -> prvi frame odmah (CHOOSE FILE ne kasni);
+        # 2 decode threada su dosta za 128x64 i ne guše Pi
+        cmd += ["-fflags", "nobuffer", "-flags", "low_delay", "-threads", "2"]
         if self.loop_forever:
             cmd += ["-stream_loop", "-1"]
+        if self.use_hw:
+            cmd += ["-c:v", HW_DECODER]
         cmd += [
             "-i", self.path,
-            "-vf", f"scale={W}:{H}:force_original_aspect_ratio=decrease,"
+            # scale radi resize + yuv->rgb u jednom swscale prolazu (format=rgb24
+            # odmah iza), pad onda samo kopira rgb redove
+            "-vf", f"scale={W}:{H}:force_original_aspect_ratio=decrease:flags=fast_bilinear,"
+                   f"format=rgb24,"
                    f"pad={W}:{H}:(ow-iw)/2:(oh-ih)/2:black",
             "-f", "rawvideo",
             "-pix_fmt", "rgb24",
@@ -348,18 +580,71 @@ class FFMpegVideo:
         ]
         try:
             self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            return True
         except Exception:
             self.proc = None
             return False
 
+        try:
+            fcntl.fcntl(self.proc.stdout.fileno(), F_SETPIPE_SZ, self.bufsize * PIPE_FRAMES)
+        except Exception:
+            pass
+
+        self._free = queue.Queue()
+        self._ready = queue.Queue()
+        for _ in range(self.NBUF):
+            self._free.put(bytearray(self.bufsize))
+        self._eof = False
+        self._frames = 0
+        self._reader = threading.Thread(target=self._read_loop, args=(self.proc,), daemon=True)
+        self._reader.start()
+        return True
+
+    def _read_loop(self, proc: subprocess.Popen):
+        # blokirajući read ide ovdje, da main loop (input/meni) nikad ne čeka ffmpeg
+        free, ready = self._free, self._ready
+        try:
+            while self.proc is proc:
+                try:
+                    buf = free.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                n = proc.stdout.readinto(buf)
+                if n != self.bufsize:
+                    break
+                ready.put(buf)
+        except Exception:
+            pass
+        ready.put(None)
+
     def read_frame(self) -> Optional[Image.Image]:
-        if not self.proc or not self.proc.stdout:
+        """
+        Non-blocking: novi frame ako je spreman, inače zadnji prikazani;
+        None na EOF / grešku. Vraćena slika se reciklira.
+        """
+        global _hw_decoder_ok
+        if not self.proc or self._eof:
             return None
-        data = self.proc.stdout.read(self.bufsize)
-        if not data or len(data) != self.bufsize:
+        try:
+            buf = self._ready.get_nowait()
+        except queue.Empty:
+            return self._img
+        if buf is None:
+            if self.use_hw and self._frames == 0:
+                # H.264 a HW dekoder ipak ne radi (npr. Pi 5, nema /dev/video10)
+                # -> ovaj fajl i svi sljedeći idu u softveru; za neprobani fajl
+                # (možda nije H.264) samo ovaj
+                if _video_codecs.get(self.path) == "h264":
+                    _hw_decoder_ok = False
+                self.use_hw = False
+                self.close()
+                if self.open():
+                    return self._img
+            self._eof = True
             return None
-        return Image.frombytes("RGB", (W, H), data)
+        self._img.frombytes(buf)
+        self._free.put(buf)
+        self._frames += 1
+        return self._img
 
     def close(self):
         try:
@@ -374,7 +659,8 @@ class FFMpegVideo:
 # =========================
 def fit_image_to_screen(im: Image.Image) -> Image.Image:
     # GIF frame fit (letterbox), ali bez teksta u playbacku
-    im = im.convert("RGB")
+    if im.mode != "RGB":
+        im = im.convert("RGB")
     src_w, src_h = im.size
     if src_w <= 0 or src_h <= 0:
         return Image.new("RGB", (W, H), BG)
@@ -382,7 +668,12 @@ def fit_image_to_screen(im: Image.Image) -> Image.Image:
     scale = min(W / src_w, H / src_h)
     nw = max(1, int(src_w * scale))
     nh = max(1, int(src_h * scale))
-    rim = im.resize((nw, nh), Image.BILINEAR)
+    # reducing_gap: Pillow prvo radi brzi cjelobrojni reduce() (box), pa tek onda
+    # bilinear na malo veći međurezultat -> puno brže za velike GIF-ove
+    rim = im.resize((nw, nh), Image.BILINEAR, reducing_gap=2.0)
+    if nw == W and nh == H:
+        # već puni ekran -> nema letterboxa, nema dodatnog canvasa
+        return rim
 
     out = Image.new("RGB", (W, H), BG)
     ox = (W - nw) // 2
@@ -390,6 +681,90 @@ def fit_image_to_screen(im: Image.Image) -> Image.Image:
     out.paste(rim, (ox, oy))
     return out
 
+def load_gif_frames(path: str) -> List[Tuple[bytes, float]]:
+    try:
+        im = Image.open(path)
+        frames = []
+        for fr in ImageSequence.Iterator(im):
+            delay_ms = fr.info.get("duration", DEFAULT_GIF_FALLBACK_MS)
+            delay_sec = max(0.02, float(delay_ms) / 1000.0)
+            frames.append((fit_image_to_screen(fr).tobytes(), delay_sec))
+        return frames if frames else [(fit_image_to_screen(im).tobytes(), 0.08)]
+    except Exception:
+        return [(Image.new("RGB", (W, H), BG).tobytes(), 0.2)]
+
+class MediaPreloader:
+    """
+    PLAY ALL: sljedeći fajl se priprema u pozadini (ffmpeg proces koji stane
+    kad napuni pipe / dekodirani GIF frameovi), pa je prelazak bez pauze.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._path: Optional[str] = None
+        self._ready: Optional[Tuple[Optional[FFMpegVideo], Optional[List[Tuple[bytes, float]]]]] = None
+
+    def start(self, path: str, kind: str):
+        with self._lock:
+            self._discard()
+            self._gen += 1
+            self._path = path
+            gen = self._gen
+        threading.Thread(target=self._load, args=(gen, path, kind), daemon=True).start()
+
+    def _load(self, gen: int, path: str, kind: str):
+        vid: Optional[FFMpegVideo] = None
+        gif: Optional[List[Tuple[bytes, float]]] = None
+        if kind == "gif":
+            gif = load_gif_frames(path)
+        else:
+            vid = FFMpegVideo(path, loop_forever=False)
+            if not vid.open():
+                vid = None
+        with self._lock:
+            if gen == self._gen:
+                self._ready = (vid, gif)
+                return
+        if vid:
+            vid.close()
+
+    def take(self, path: str) -> Tuple[Optional[FFMpegVideo], Optional[List[Tuple[bytes, float]]]]:
+        """Pripremljeni (vid, gif) za path ili (None, None); sve ostalo se odbacuje."""
+        with self._lock:
+            ready = self._ready if path == self._path else None
+            if ready is not None:
+                self._ready = None
+            self._discard()
+            self._gen += 1
+        return ready if ready is not None else (None, None)
+
+    def cancel(self):
+        with self._lock:
+            self._discard()
+            self._gen += 1
+
+    def _discard(self):
+        if self._ready is not None and self._ready[0]:
+            self._ready[0].close()
+        self._ready = None
+        self._path = None
+
+def gif_advance(frames: List[Tuple[bytes, float]], i: int, t: float, dt: float) -> Tuple[int, float, bool]:
+    """
+    Pomakne GIF za dt. Višak vremena se prenosi u sljedeći frame (bez drifta
+    zbog 16ms ticka). Vraća (index, vrijeme u frameu, wrapped).
+    """
+    t += dt
+    wrapped = False
+    n = len(frames)
+    while t >= frames[i][1]:
+        t -= frames[i][1]
+        i += 1
+        if i >= n:
+            i = 0
+            wrapped = True
+    return i, t, wrapped
+
 # =========================
 # UI
 # =========================
@@ -463,6 +838,14 @@ def main():
     matrix = make_matrix()
     base_img = Image.new("RGB", (W, H), BG)
 
+    # double buffer: upload u offscreen canvas, zamjena na vsync (bez tearinga)
+    offscreen = matrix.CreateFrameCanvas()
+
+    def show(img: Image.Image):
+        nonlocal offscreen
+        offscreen.SetImage(img, 0, 0)
+        offscreen = matrix.SwapOnVSync(offscreen)
+
     font_mid = load_font(11)
     font_small = load_font(10)
 
@@ -471,6 +854,7 @@ def main():
 
     # active media source (USB > local)
     active_media_dir = choose_active_media_dir()
+    active_media_mtime = dir_mtime(active_media_dir)
     files = list_media_files(active_media_dir)
     selected_idx = 0
 
@@ -489,15 +873,24 @@ def main():
     prev_up = prev_down = False
 
     # rescan (USB hotplug)
-    RESCAN_EVERY = 2.0
+    watcher = DirWatcher()
     last_rescan = time.time()
 
+    def watch_media_dirs():
+        for p in ("/media", "/media/pi", "/mnt/usb", active_media_dir):
+            watcher.watch(p)
+
     # player state
     current_path: Optional[str] = files[selected_idx] if files else None
     current_type: Optional[str] = None  # "gif" | "vid"
-    gif_frames: List[Tuple[Image.Image, float]] = []
+    # GIF frameovi kao sirovi rgb24 bytes (manje memorije od PIL slika);
+    # prikazuju se kroz jednu trajnu sliku koja se puni samo kad se frame promijeni
+    gif_frames: List[Tuple[bytes, float]] = []
     gif_i = 0
     gif_t = 0.0
+    gif_img = Image.new("RGB", (W, H), BG)
+    gif_shown = -1
+    black_frame = gif_img.tobytes()
     vid: Optional[FFMpegVideo] = None
 
     def detect_type(path: str) -> str:
@@ -505,6 +898,8 @@ def main():
         if ext in GIF_EXT: return "gif"
         return "vid"
 
+    preloader = MediaPreloader()
+
     def close_media():
         nonlocal vid, gif_frames
         if vid:
@@ -513,32 +908,36 @@ def main():
         gif_frames = []
 
     def open_media(path: str):
-        nonlocal current_path, current_type, gif_frames, gif_i, gif_t, vid
+        nonlocal current_path, current_type, gif_frames, gif_i, gif_t, gif_shown, vid
         close_media()
         current_path = path
         current_type = detect_type(path)
         gif_i = 0
         gif_t = 0.0
+        gif_shown = -1
+        pre_vid, pre_gif = preloader.take(path)
 
         if current_type == "gif":
-            try:
-                im = Image.open(path)
-                frames = []
-                for fr in ImageSequence.Iterator(im):
-                    delay_ms = fr.info.get("duration", DEFAULT_GIF_FALLBACK_MS)
-                    delay_sec = max(0.02, float(delay_ms) / 1000.0)
-                    frames.append((fit_image_to_screen(fr), delay_sec))
-                gif_frames[:] = frames if frames else [(fit_image_to_screen(im), 0.08)]
-            except Exception:
-                gif_frames[:] = [(Image.new("RGB", (W, H), BG), 0.2)]
+            gif_frames[:] = pre_gif if pre_gif is not None else load_gif_frames(path)
 
         else:
             loop_forever = (not mode_play_all)  # loop only in LOOP ONE
-            vid = FFMpegVideo(path, loop_forever=loop_forever)
-            if not vid.open():
-                # ako nema ffmpeg ili greška, samo crno
-                current_type = "gif"
-                gif_frames[:] = [(Image.new("RGB", (W, H), BG), 0.2)]
+            if pre_vid and pre_vid.loop_forever == loop_forever:
+                vid = pre_vid
+            else:
+                if pre_vid:
+                    pre_vid.close()
+                vid = FFMpegVideo(path, loop_forever=loop_forever)
+                if not vid.open():
+                    # ako nema ffmpeg ili greška, samo crno
+                    current_type = "gif"
+                    gif_frames[:] = [(black_frame, 0.2)]
+
+        # PLAY ALL -> odmah pripremi sljedeći fajl
+        if mode_play_all and len(files) > 1:
+            nxt = files[(selected_idx + 1) % len(files)]
+            if nxt != path:
+                preloader.start(nxt, detect_type(nxt))
 
     def advance_to_next_file():
         nonlocal selected_idx
@@ -548,12 +947,14 @@ def main():
         open_media(files[selected_idx])
 
     def rescan_media():
-        nonlocal active_media_dir, files, selected_idx, current_path
+        nonlocal active_media_dir, active_media_mtime, files, selected_idx, current_path
 
         new_dir = choose_active_media_dir()
         if new_dir != active_media_dir:
             active_media_dir = new_dir
+            active_media_mtime = dir_mtime(active_media_dir)
             files = list_media_files(active_media_dir)
+            probe_video_codecs(files)
             selected_idx = 0
             current_path = files[0] if files else None
             if current_path:
@@ -562,10 +963,16 @@ def main():
                 close_media()
             return
 
-        # isti dir, ali moguće da su se fajlovi promijenili
+        # isti dir, ali moguće da su se fajlovi promijenili (mtime foldera se
+        # mijenja na add/delete/rename -> inače nema potrebe listati)
+        mtime = dir_mtime(active_media_dir)
+        if mtime == active_media_mtime:
+            return
+        active_media_mtime = mtime
         new_files = list_media_files(active_media_dir)
         if new_files != files:
             files = new_files
+            probe_video_codecs(files)
             if not files:
                 selected_idx = 0
                 close_media()
@@ -578,7 +985,34 @@ def main():
                     selected_idx = 0
                     open_media(files[0])
 
+    # gotovi UI frameovi (meni / picker) — crtaju se samo kad se stanje promijeni
+    UI_CACHE_MAX = 16
+    ui_cache: Dict[tuple, Image.Image] = {}
+
+    def cached_ui(key: tuple, render: Callable[[Image.Image], None]) -> Image.Image:
+        frame = ui_cache.get(key)
+        if frame is None:
+            if len(ui_cache) >= UI_CACHE_MAX:
+                # recikliraj najstariji buffer umjesto nove alokacije
+                frame = ui_cache.pop(next(iter(ui_cache)))
+                frame.paste(base_img)
+            else:
+                frame = base_img.copy()
+            dim_overlay(frame, alpha=155)
+            render(frame)
+            ui_cache[key] = frame
+        return frame
+
+    def render_no_files(frame: Image.Image):
+        d = ImageDraw.Draw(frame)
+        d.rectangle((10, 14, 118, 50), fill=MENU_BG, outline=MENU_DIM)
+        msg = "NO VIDEO/GIF FILES"
+        tw = text_width(d, msg, font_small)
+        draw_text_crisp(frame, ((W - tw)//2, 28), msg, font_small, fill=MENU_FG, threshold=75)
+
     # init
+    watch_media_dirs()
+    probe_video_codecs(files)
     if current_path:
         open_media(current_path)
 
@@ -595,9 +1029,10 @@ def main():
             inp = js.pop()
 
             # periodic rescan (USB hotplug + file changes)
-            if (time.time() - last_rescan) >= RESCAN_EVERY:
+            if watcher.changed() or (time.time() - last_rescan) >= watcher.rescan_every():
                 last_rescan = time.time()
                 rescan_media()
+                watch_media_dirs()
 
             # menu toggle
             if (inp.start or inp.select) and (time.time() - last_menu_toggle > MENU_DEBOUNCE):
@@ -634,31 +1069,28 @@ def main():
                         picker_scroll = max(0, min(selected_idx, max(0, len(files) - 4)))
                     elif item == "PLAY MODE":
                         mode_play_all = not mode_play_all
-                        # re-open current video to apply loop mode
-                        if current_path and detect_type(current_path) == "vid":
+                        # PLAY ALL -> LOOP ONE: ne diraj ffmpeg, EOF grana ga ponovno
+                        # otvori s -stream_loop. Restart samo ako vrti -stream_loop
+                        # a sad treba PLAY ALL (taj proces nikad ne dođe do EOF).
+                        if vid and vid.loop_forever and mode_play_all:
                             open_media(current_path)
                     elif item == "EXIT":
                         close_media()
                         exec_launcher_or_exit(matrix)
 
-                frame = base_img.copy()
-                dim_overlay(frame, alpha=155)
-                draw_menu_overlay(frame, menu_idx, font_mid, mode_play_all)
-                matrix.SetImage(frame, 0, 0)
+                frame = cached_ui(
+                    ("menu", menu_idx, mode_play_all),
+                    lambda f: draw_menu_overlay(f, menu_idx, font_mid, mode_play_all),
+                )
+                show(frame)
                 time.sleep(0.016)
                 continue
 
             # ===== FILE PICKER =====
             if picker:
                 if not files:
-                    frame = base_img.copy()
-                    dim_overlay(frame, alpha=155)
-                    d = ImageDraw.Draw(frame)
-                    d.rectangle((10, 14, 118, 50), fill=MENU_BG, outline=MENU_DIM)
-                    msg = "NO VIDEO/GIF FILES"
-                    tw = text_width(d, msg, font_small)
-                    draw_text_crisp(frame, ((W - tw)//2, 28), msg, font_small, fill=MENU_FG, threshold=75)
-                    matrix.SetImage(frame, 0, 0)
+                    frame = cached_ui(("no_files",), render_no_files)
+                    show(frame)
                     time.sleep(0.016)
                     continue
 
@@ -679,16 +1111,17 @@ def main():
                     open_media(files[selected_idx])
                     picker = False
 
-                frame = base_img.copy()
-                dim_overlay(frame, alpha=155)
-                draw_file_picker(frame, files, selected_idx, picker_scroll, font_mid, font_small)
-                matrix.SetImage(frame, 0, 0)
+                frame = cached_ui(
+                    ("picker", selected_idx, picker_scroll, tuple(files[picker_scroll:picker_scroll + 4])),
+                    lambda f: draw_file_picker(f, files, selected_idx, picker_scroll, font_mid, font_small),
+                )
+                show(frame)
                 time.sleep(0.016)
                 continue
 
             # ===== PLAYBACK (NO TEXT) =====
             if not current_path:
-                matrix.SetImage(base_img, 0, 0)
+                show(base_img)
                 time.sleep(0.05)
                 continue
 
@@ -700,29 +1133,26 @@ def main():
                         advance_to_next_file()
                     else:
                         open_media(current_path)
-                    matrix.SetImage(base_img, 0, 0)
+                    show(base_img)
                     time.sleep(0.016)
                     continue
 
-                matrix.SetImage(fr, 0, 0)
+                show(fr)
 
             else:
                 # GIF
                 if not gif_frames:
                     open_media(current_path)
 
-                frame, delay = gif_frames[gif_i]
-                gif_t += dt
+                if gif_shown != gif_i:
+                    gif_img.frombytes(gif_frames[gif_i][0])
+                    gif_shown = gif_i
 
-                if gif_t >= delay:
-                    gif_t = 0.0
-                    gif_i += 1
-                    if gif_i >= len(gif_frames):
-                        gif_i = 0
-                        if mode_play_all:
-                            advance_to_next_file()
+                gif_i, gif_t, wrapped = gif_advance(gif_frames, gif_i, gif_t, dt)
+                if wrapped and mode_play_all:
+                    advance_to_next_file()
 
-                matrix.SetImage(frame, 0, 0)
+                show(gif_img)
 
             time.sleep(0.016)
 
@@ -731,6 +1161,8 @@ def main():
             close_media()
         except Exception:
             pass
+        preloader.cancel()
+        watcher.close()
         js.stop()
         try:
             matrix.Clear()
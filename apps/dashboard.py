@@ -17,15 +17,20 @@
 
 import os
 import time
+import re
 import json
 import math
+import array
+import functools
 import struct
+import socket
+import selectors
 import threading
-import subprocess
 import errno
 import fcntl
 from typing import Optional, Dict, Any, Tuple, List
 
+import urllib.error
 import urllib.request
 from PIL import Image, ImageDraw, ImageFont
 from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -42,6 +47,12 @@ LAUNCHER_PATH = "/home/pi/pimatrixos/launcher.py"
 # Weather
 WEATHER_REFRESH_SEC = 15 * 60  # 15 min cache
 WEATHER_TIMEOUT_SEC = 4
+WEATHER_RETRY_SEC = 30  # after a failed fetch
+WEATHER_STALE_MAX_SEC = 3 * 60 * 60  # keep showing old data this long when offline
+WTTR_RAW_PATH = "/tmp/wttr.json"  # last payload + ETag
+
+# Frame pacing (25 FPS)
+FRAME_PERIOD = 0.04
 
 # Menu timings
 NAV_REPEAT = 0.14
@@ -55,15 +66,24 @@ DIM_NIGHT_END = 7     # 07:00
 DIM_FACTOR_NIGHT = 0.35  # multiply brightness
 
 # Gamepad mapping (per your setup)
-BTN_OK = {0, 1}       # A/X
-BTN_BACK = {2, 3}     # B/Y
+BTN_OK = frozenset({0, 1})    # A/X
+BTN_BACK = frozenset({2, 3})  # B/Y
 BTN_SELECT = 8
 BTN_START = 9
 
+# button number -> edge event name (one dict lookup per press)
+BTN_ACTION = {
+    **{n: "ok" for n in BTN_OK},
+    **{n: "back" for n in BTN_BACK},
+    BTN_START: "start",
+    BTN_SELECT: "select",
+}
+
 # Joystick device
 JS_DEV = "/dev/input/js0"
 FMT = "IhBB"
-SZ = struct.calcsize(FMT)
+JS_EVENT = struct.Struct(FMT)
+SZ = JS_EVENT.size
 
 
 def clamp(v, lo, hi):
@@ -124,32 +144,67 @@ def make_matrix(brightness: int) -> RGBMatrix:
     return RGBMatrix(options=opts)
 
 
+# (text, id(font)) -> width; fonts live for the whole process so ids are stable
+_TEXT_W: Dict[Tuple[str, int], int] = {}
+
+
 def text_width(d: ImageDraw.ImageDraw, text: str, font) -> int:
+    key = (text, id(font))
+    tw = _TEXT_W.get(key)
+    if tw is not None:
+        return tw
     try:
-        return int(d.textlength(text, font=font))
+        tw = int(d.textlength(text, font=font))
     except Exception:
         bbox = d.textbbox((0, 0), text, font=font)
-        return int(bbox[2] - bbox[0])
+        tw = int(bbox[2] - bbox[0])
+    if len(_TEXT_W) >= 256:
+        _TEXT_W.clear()
+    _TEXT_W[key] = tw
+    return tw
+
+
+# (text, id(font), threshold) -> (mask, bbox left, bbox top); LRU by insertion order
+_TEXT_MASKS: Dict[Tuple[str, int, int], Tuple[Image.Image, int, int]] = {}
+TEXT_MASK_CACHE_MAX = 64
+
+
+def _text_mask(text: str, font, threshold: int) -> Optional[Tuple[Image.Image, int, int]]:
+    key = (text, id(font), threshold)
+    m = _TEXT_MASKS.pop(key, None)
+    if m is None:
+        # mask only as big as the text, thresholded once
+        l, t, r, b = font.getbbox(text)
+        if r <= l or b <= t:
+            return None
+        mask = Image.new("L", (r - l, b - t), 0)
+        md = ImageDraw.Draw(mask)
+        md.text((-l, -t), text, font=font, fill=255)
+        mask = mask.point(lambda p: 255 if p >= threshold else 0)
+        m = (mask, l, t)
+        if len(_TEXT_MASKS) >= TEXT_MASK_CACHE_MAX:
+            _TEXT_MASKS.pop(next(iter(_TEXT_MASKS)))
+    _TEXT_MASKS[key] = m
+    return m
 
 
 def draw_text_crisp(img_rgb: Image.Image, pos, text: str, font, fill=(255, 255, 255), threshold: int = 60):
     if not text:
         return
     x, y = pos
-    mask = Image.new("L", (W, H), 0)
-    md = ImageDraw.Draw(mask)
-    md.text((x, y), text, font=font, fill=255)
-    mask = mask.point(lambda p: 255 if p >= threshold else 0)
-
-    layer = Image.new("RGB", (W, H), (0, 0, 0))
-    ld = ImageDraw.Draw(layer)
-    ld.rectangle((0, 0, W, H), fill=fill)
-    img_rgb.paste(layer, (0, 0), mask)
+    m = _text_mask(text, font, threshold)
+    if m is None:
+        return
+    # solid colour straight through the mask, no full-screen layer/mask
+    mask, l, t = m
+    img_rgb.paste(fill, (x + l, y + t, x + l + mask.width, y + t + mask.height), mask)
 
 
 def draw_centered_crisp(img_rgb: Image.Image, y: int, text: str, font, fill=(255, 255, 255)):
-    d = ImageDraw.Draw(img_rgb)
-    tw = text_width(d, text, font)
+    key = (text, id(font))
+    tw = _TEXT_W.get(key)
+    if tw is None:
+        tw = text_width(ImageDraw.Draw(img_rgb), text, font)
     x = (W - tw) // 2
     draw_text_crisp(img_rgb, (x, y), text, font, fill=fill)
 
@@ -157,34 +212,53 @@ def draw_centered_crisp(img_rgb: Image.Image, y: int, text: str, font, fill=(255
 # =========================
 # INPUT (non-blocking js0)
 # =========================
+# edge events as bits (one int per batch in the Joy ring, pop_events() -> int)
+EV_UP = 1
+EV_DOWN = 2
+EV_LEFT = 4
+EV_RIGHT = 8
+EV_OK = 16
+EV_BACK = 32
+EV_START = 64
+EV_SELECT = 128
+EVENT_BITS = {
+    "up": EV_UP, "down": EV_DOWN, "left": EV_LEFT, "right": EV_RIGHT,
+    "ok": EV_OK, "back": EV_BACK, "start": EV_START, "select": EV_SELECT,
+}
+RING_SIZE = 64  # power of two
+
+# axis -> (negative, positive) edge event
+AXIS_EVENTS = (("left", "right"), ("up", "down"))
+
+
 class Joy(threading.Thread):
+    """
+    Reader thread -> main loop is single producer / single consumer, so edge
+    events go through a ring of bitmasks with plain int head/tail indices
+    (each store is atomic under the GIL) instead of a locked dict.
+    """
     def __init__(self, path=JS_DEV):
         super().__init__(daemon=True)
         self.path = path
         self._stop = False
-        self._lock = threading.Lock()
         self._btn = {}  # num -> pressed
         self._axis = {0: 0, 1: 0}  # x,y state -1/0/+1 edge detected
-        self._events = {
-            "up": False, "down": False, "left": False, "right": False,
-            "ok": False, "back": False, "start": False, "select": False
-        }
+        self._ring = array.array("I", [0] * RING_SIZE)
+        self._head = 0  # written only by the reader thread
+        self._tail = 0  # written only by pop_events()
         self.DEADZONE = 12000
 
     def stop(self):
         self._stop = True
 
-    def pop_events(self) -> Dict[str, bool]:
-        with self._lock:
-            ev = dict(self._events)
-            for k in self._events:
-                self._events[k] = False
-            return ev
-
-    def _push(self, **kwargs):
-        with self._lock:
-            for k, v in kwargs.items():
-                self._events[k] = self._events[k] or v
+    def pop_events(self) -> int:
+        """OR of all EV_* edges since the last call (0 if none); no allocation."""
+        head = self._head
+        bits = 0
+        for i in range(self._tail, head):
+            bits |= self._ring[i & (RING_SIZE - 1)]
+        self._tail = head
+        return bits
 
     def _open_nonblock(self):
         if not os.path.exists(self.path):
@@ -195,6 +269,50 @@ class Joy(threading.Thread):
         fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
         return f
 
+    def _decode(self, value: int, etype: int, num: int) -> Optional[str]:
+        """Update axis/button state (reader thread only) and return the edge event name, if any."""
+        if (etype & 0x80) != 0:
+            return None
+        et = etype & 0x7F
+
+        # Axis: sign with deadzone, same code for X and Y
+        if et == 0x02:
+            if num > 1:
+                return None
+            dz = self.DEADZONE
+            new_state = (value > dz) - (value < -dz)
+            if new_state == self._axis[num]:
+                return None
+            self._axis[num] = new_state
+            if new_state == 0:
+                return None
+            return AXIS_EVENTS[num][new_state > 0]
+
+        # Buttons
+        elif et == 0x01:
+            if value == 1:
+                self._btn[num] = True
+            elif value == 0:
+                self._btn[num] = False
+
+            if value == 1:
+                return BTN_ACTION.get(num)
+        return None
+
+    def _handle_batch(self, data: bytes):
+        # decode the whole read, publish once: one slot store + head bump
+        bits = 0
+        decode = self._decode
+        n = len(data) - (len(data) % SZ)
+        for _t, value, etype, num in JS_EVENT.iter_unpack(data[:n] if n != len(data) else data):
+            name = decode(value, etype, num)
+            if name:
+                bits |= EVENT_BITS[name]
+        if bits:
+            head = self._head
+            self._ring[head & (RING_SIZE - 1)] = bits
+            self._head = head + 1
+
     def run(self):
         while not self._stop:
             try:
@@ -203,81 +321,34 @@ class Joy(threading.Thread):
                     time.sleep(0.3)
                     continue
 
-                while not self._stop:
-                    try:
-                        data = f.read(SZ)
+                # block in the kernel until js0 has data (timeout only to notice stop())
+                sel = selectors.DefaultSelector()
+                sel.register(f, selectors.EVENT_READ)
+                alive = True
+
+                while alive and not self._stop:
+                    if not sel.select(timeout=0.04):
+                        continue
+
+                    # drain everything that is queued, then wait again
+                    while True:
+                        try:
+                            data = f.read(SZ * 64)
+                        except BlockingIOError:
+                            break
+                        except OSError as e:
+                            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                                alive = False
+                            break
+                        if data is None:
+                            break
                         if not data:
-                            time.sleep(0.005)
-                            continue
-                        if len(data) != SZ:
-                            time.sleep(0.005)
-                            continue
-
-                        _t, value, etype, num = struct.unpack(FMT, data)
-                        if (etype & 0x80) != 0:
-                            continue
-                        et = etype & 0x7F
-
-                        # Axis
-                        if et == 0x02:
-                            v = int(value)
-                            if num == 0:  # X
-                                new_state = 0
-                                if v < -self.DEADZONE:
-                                    new_state = -1
-                                elif v > self.DEADZONE:
-                                    new_state = +1
-                                with self._lock:
-                                    old = self._axis[0]
-                                    if new_state != old:
-                                        self._axis[0] = new_state
-                                        if new_state == -1:
-                                            self._events["left"] = True
-                                        elif new_state == +1:
-                                            self._events["right"] = True
-
-                            elif num == 1:  # Y
-                                new_state = 0
-                                if v < -self.DEADZONE:
-                                    new_state = -1
-                                elif v > self.DEADZONE:
-                                    new_state = +1
-                                with self._lock:
-                                    old = self._axis[1]
-                                    if new_state != old:
-                                        self._axis[1] = new_state
-                                        if new_state == -1:
-                                            self._events["up"] = True
-                                        elif new_state == +1:
-                                            self._events["down"] = True
-
-                        # Buttons
-                        elif et == 0x01:
-                            with self._lock:
-                                if value == 1:
-                                    self._btn[num] = True
-                                elif value == 0:
-                                    self._btn[num] = False
-
-                            if value == 1:
-                                if num in BTN_OK:
-                                    self._push(ok=True)
-                                elif num in BTN_BACK:
-                                    self._push(back=True)
-                                elif num == BTN_START:
-                                    self._push(start=True)
-                                elif num == BTN_SELECT:
-                                    self._push(select=True)
-
-                    except BlockingIOError:
-                        time.sleep(0.005)
-                    except OSError as e:
-                        if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
-                            time.sleep(0.005)
-                            continue
-                        break
+                            alive = False  # device gone -> reopen
+                            break
+                        self._handle_batch(data)
 
                 try:
+                    sel.close()
                     f.close()
                 except Exception:
                     pass
@@ -289,17 +360,41 @@ class Joy(threading.Thread):
 # =========================
 # WEATHER (wttr.in)
 # =========================
-def _fetch_wttr(postcode: str) -> Optional[Dict[str, Any]]:
+def _cache_max_age(cache_control: Optional[str]) -> Optional[int]:
+    if not cache_control:
+        return None
+    m = re.search(r"max-age=(\d+)", cache_control)
+    return int(m.group(1)) if m else None
+
+
+def _fetch_wttr(postcode: str, etag: Optional[str] = None) -> Optional[Tuple[Optional[Dict[str, Any]], Optional[str], Optional[int]]]:
+    """
+    Returns (json, etag, max_age) or None on error.
+    json is None when the server answered 304 Not Modified for `etag`.
+    """
     url = f"https://wttr.in/{postcode}?format=j1"
+    headers = {"User-Agent": "led-dashboard/1.0"}
+    if etag:
+        headers["If-None-Match"] = etag
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "led-dashboard/1.0"})
+        req = urllib.request.Request(url, headers=headers)
         with urllib.request.urlopen(req, timeout=WEATHER_TIMEOUT_SEC) as r:
             data = r.read().decode("utf-8", errors="ignore")
-        return json.loads(data)
+            new_etag = r.getheader("ETag")
+            max_age = _cache_max_age(r.getheader("Cache-Control"))
+        return json.loads(data), new_etag, max_age
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, etag, _cache_max_age(e.headers.get("Cache-Control"))
+        return None
     except Exception:
         return None
 
 
+_WKIND = re.compile(r"(snow)|(rain|drizzle|shower)|(fog|mist|haze)|(cloud|overcast)|(sun|clear)")
+_WKINDS = ("snow", "rain", "fog", "cloud", "sun")
+
+
 def _parse_weather(j: Dict[str, Any]) -> Tuple[Optional[int], str, Optional[int]]:
     """
     Returns (temp_c, kind, rain_pct)
@@ -320,18 +415,9 @@ def _parse_weather(j: Dict[str, Any]) -> Tuple[Optional[int], str, Optional[int]
         code = (cur.get("weatherCode") or "").strip()
 
         text = f"{desc} {code}".strip()
-        if "snow" in text:
-            kind = "snow"
-        elif "rain" in text or "drizzle" in text or "shower" in text:
-            kind = "rain"
-        elif "fog" in text or "mist" in text or "haze" in text:
-            kind = "fog"
-        elif "cloud" in text or "overcast" in text:
-            kind = "cloud"
-        elif "sun" in text or "clear" in text:
-            kind = "sun"
-        else:
-            kind = "unknown"
+        # one scan; lowest group index wins (snow > rain > fog > cloud > sun)
+        hits = [m.lastindex for m in _WKIND.finditer(text)]
+        kind = _WKINDS[min(hits) - 1] if hits else "unknown"
     except Exception:
         pass
 
@@ -357,42 +443,135 @@ def _parse_weather(j: Dict[str, Any]) -> Tuple[Optional[int], str, Optional[int]
 
 
 class WeatherCache:
+    """
+    Fetches on its own daemon thread; the render loop only reads `snapshot`
+    (ok, temp_c, kind, rain_pct), which is replaced as one tuple.
+    """
     def __init__(self):
         self.last = 0.0
-        self.temp_c: Optional[int] = None
-        self.kind: str = "unknown"
-        self.rain_pct: Optional[int] = None
-        self.ok: bool = False
+        self.snapshot: Tuple[bool, Optional[int], str, Optional[int]] = (False, None, "unknown", None)
+        self.refresh_sec = WEATHER_REFRESH_SEC
+
+        # last good payload + validator (also on disk, survives restarts)
+        self._pc: Optional[str] = None
+        self._etag: Optional[str] = None
+        self._json: Optional[Dict[str, Any]] = None
+        self._load_raw()
+
+        self._want_pc: Optional[str] = None  # set by the first update()
+        self._tick = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def ok(self) -> bool:
+        return self.snapshot[0]
+
+    def _load_raw(self):
+        try:
+            with open(WTTR_RAW_PATH, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            self._pc = raw["postcode"]
+            self._etag = raw.get("etag")
+            self._json = raw["body"]
+            # show the last known weather right away; the worker refreshes it
+            # immediately if it is older than its TTL
+            self.last = float(raw.get("ts", 0.0))
+            self.refresh_sec = int(raw.get("refresh_sec", WEATHER_REFRESH_SEC))
+            self._apply(self._json)
+        except Exception:
+            pass
+
+    def _save_raw(self):
+        try:
+            tmp = WTTR_RAW_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "postcode": self._pc, "etag": self._etag, "body": self._json,
+                    "ts": self.last, "refresh_sec": self.refresh_sec,
+                }, f)
+            os.replace(tmp, WTTR_RAW_PATH)
+        except Exception:
+            pass
+
+    def _apply(self, j: Dict[str, Any]):
+        t, k, rp = _parse_weather(j)
+        self.snapshot = (t is not None, t, k, rp)
 
     def update(self, postcode: str):
-        now = time.time()
-        if postcode and self.ok and (now - self.last) < WEATHER_REFRESH_SEC:
-            return
+        """Non-blocking: remember the postcode and wake the worker if it changed."""
+        if postcode != self._want_pc:
+            self._want_pc = postcode
+            self._tick.set()
+
+    def _run(self):
+        self._tick.wait()
+        while True:
+            self._tick.clear()
+            if self._refresh(self._want_pc or ""):
+                wait = self.refresh_sec - (time.time() - self.last)
+            else:
+                wait = WEATHER_RETRY_SEC
+            self._tick.wait(timeout=max(1.0, wait))
 
+    def _refresh(self, postcode: str) -> bool:
+        """False if a fetch was needed and failed (-> retry sooner)."""
+        now = time.time()
         if not postcode:
-            self.ok = False
-            self.temp_c = None
-            self.kind = "unknown"
-            self.rain_pct = None
-            return
-
-        j = _fetch_wttr(postcode)
-        if not j:
-            self.ok = False
-            self.rain_pct = None
-            return
+            self.snapshot = (False, None, "unknown", None)
+            return True
+
+        fresh = self.ok and (now - self.last) < self.refresh_sec
+        if fresh and postcode == self._pc:
+            return True
+
+        same = postcode == self._pc and self._json is not None
+        res = _fetch_wttr(postcode, self._etag if same else None)
+        if not res:
+            # keep showing the last good weather for this postcode for a while
+            if not (same and self.ok and (now - self.last) < WEATHER_STALE_MAX_SEC):
+                _ok, t, k, _rp = self.snapshot
+                self.snapshot = (False, t, k, None)
+            return False
+
+        j, etag, max_age = res
+        if j is None:
+            # 304: payload unchanged -> no transfer, parse only if not shown yet
+            if not self.ok:
+                self._apply(self._json)
+        else:
+            self._pc, self._etag, self._json = postcode, etag, j
+            self._apply(j)
 
-        t, k, rp = _parse_weather(j)
-        self.temp_c = t
-        self.kind = k
-        self.rain_pct = rp
-        self.ok = t is not None
+        # max-age may only lengthen the interval (free, rate-limited service)
+        self.refresh_sec = max(WEATHER_REFRESH_SEC, max_age or 0)
         self.last = now
+        self._save_raw()
+        return True
 
 
 # =========================
 # SYSTEM INFO
 # =========================
+def _ttl(seconds: float):
+    """Memoize per-args for `seconds`; these values change on a seconds scale, not per frame."""
+    def deco(fn):
+        cache: Dict[tuple, Tuple[float, Any]] = {}
+
+        @functools.wraps(fn)
+        def wrap(*args):
+            now = time.monotonic()
+            e = cache.get(args)
+            if e is not None and (now - e[0]) < seconds:
+                return e[1]
+            v = fn(*args)
+            cache[args] = (now, v)
+            return v
+        return wrap
+    return deco
+
+
+@_ttl(2.0)
 def cpu_temp_c() -> Optional[float]:
     try:
         with open("/sys/class/thermal/thermal_zone0/temp", "r", encoding="utf-8") as f:
@@ -402,6 +581,7 @@ def cpu_temp_c() -> Optional[float]:
         return None
 
 
+@_ttl(5.0)
 def load_1m() -> Optional[float]:
     try:
         return float(os.getloadavg()[0])
@@ -409,17 +589,21 @@ def load_1m() -> Optional[float]:
         return None
 
 
+def _meminfo_kb(blob: str, name: str) -> int:
+    i = blob.index(name) + len(name)
+    j = blob.index("\n", i)
+    return int(blob[i:j].split()[0])
+
+
+@_ttl(2.0)
 def ram_used_pct() -> Optional[int]:
     try:
-        mem_total = None
-        mem_avail = None
-        with open("/proc/meminfo", "r", encoding="utf-8") as f:
-            for line in f:
-                if line.startswith("MemTotal:"):
-                    mem_total = int(line.split()[1])
-                elif line.startswith("MemAvailable:"):
-                    mem_avail = int(line.split()[1])
-        if not mem_total or mem_avail is None:
+        # MemTotal / MemAvailable are the 1st and 3rd lines -> one short read
+        with open("/proc/meminfo", "r", encoding="ascii", errors="ignore") as f:
+            blob = f.read(512)
+        mem_total = _meminfo_kb(blob, "MemTotal:")
+        mem_avail = _meminfo_kb(blob, "MemAvailable:")
+        if not mem_total:
             return None
         used = mem_total - mem_avail
         return int(round(100.0 * used / mem_total))
@@ -427,6 +611,7 @@ def ram_used_pct() -> Optional[int]:
         return None
 
 
+@_ttl(30.0)
 def disk_used_pct(path="/") -> Optional[int]:
     try:
         st = os.statvfs(path)
@@ -440,13 +625,53 @@ def disk_used_pct(path="/") -> Optional[int]:
         return None
 
 
+SIOCGIFADDR = 0x8915
+
+
+def iface_ips(s: socket.socket) -> List[str]:
+    """IPv4 address of every interface that has one (what `hostname -I` lists)."""
+    ips = []
+    for _idx, name in socket.if_nameindex():
+        try:
+            req = struct.pack("256s", name.encode()[:15])
+            ips.append(socket.inet_ntoa(fcntl.ioctl(s.fileno(), SIOCGIFADDR, req)[20:24]))
+        except OSError:
+            continue
+    return ips
+
+
+@_ttl(30.0)
 def get_ip() -> Optional[str]:
+    # UDP connect only picks the outbound route/source address: no packet, no fork
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        out = subprocess.check_output(["hostname", "-I"], text=True).strip()
-        parts = [p for p in out.split() if p and not p.startswith("127.")]
-        return parts[0] if parts else None
-    except Exception:
+        try:
+            s.connect(("10.255.255.255", 1))
+            cands = [s.getsockname()[0]]
+        except OSError:
+            # no route covering 10/8 (e.g. LAN without a default gateway):
+            # fall back to the interface addresses
+            cands = iface_ips(s)
+        for ip in cands:
+            if ip and not ip.startswith(("127.", "0.")):
+                return ip
+        return None
+    except OSError:
         return None
+    finally:
+        s.close()
+
+
+@_ttl(30.0)
+def uptime_str() -> str:
+    try:
+        with open("/proc/uptime", "r", encoding="utf-8") as f:
+            sec = float(f.read().split()[0])
+        days = int(sec // 86400)
+        hrs = int((sec % 86400) // 3600)
+        return f"UP {days}d{hrs}h" if days > 0 else f"UP {hrs}h"
+    except Exception:
+        return "UP ?"
 
 
 # =========================
@@ -510,6 +735,34 @@ def draw_icon(img: Image.Image, kind: str, x: int, y: int, frame: int):
         d.rectangle((x + 8, y + 8, x + 24, y + 24), outline=MID)
 
 
+ICON_SIZE = 32
+_ICON_SPRITES: Dict[Tuple[str, Any], Image.Image] = {}
+
+
+def _icon_phase(kind: str, frame: int):
+    # everything in draw_icon that depends on `frame`, reduced to a hashable key
+    if kind in ("sun", "snow"):
+        return (frame % 8) < 4
+    if kind == "rain":
+        return frame % 6
+    if kind == "cloud":
+        return int(2 * math.sin(frame / 6.0))
+    if kind == "fog":
+        return tuple(int(1 * math.sin((frame + i * 2) / 4.0)) for i in range(3))
+    return 0
+
+
+def blit_icon(img: Image.Image, kind: str, x: int, y: int, frame: int):
+    """draw_icon, but each (kind, phase) is rasterized once into an RGBA sprite and pasted."""
+    key = (kind, _icon_phase(kind, frame))
+    spr = _ICON_SPRITES.get(key)
+    if spr is None:
+        spr = Image.new("RGBA", (ICON_SIZE, ICON_SIZE), (0, 0, 0, 0))
+        draw_icon(spr, kind, 0, 0, frame)
+        _ICON_SPRITES[key] = spr
+    img.paste(spr, (x, y), spr)
+
+
 # =========================
 # MENU
 # =========================
@@ -560,14 +813,28 @@ def draw_menu(img: Image.Image, font: ImageFont.ImageFont, sel: int,
 # =========================
 # BRIGHTNESS (auto dim)
 # =========================
+# result only changes on an hour boundary -> [valid_until, (base, autodim), value]
+_bright_cache: List[Any] = [0.0, None, 0]
+
+
 def compute_brightness(base: int, autodim: bool) -> int:
     if not autodim:
         return int(base)
-    hr = int(time.strftime("%H"))
+    now = time.time()
+    if _bright_cache[1] == (base, autodim) and now < _bright_cache[0]:
+        return _bright_cache[2]
+
+    lt = time.localtime(now)
+    hr = lt.tm_hour
     night = (hr >= DIM_NIGHT_START) or (hr < DIM_NIGHT_END)
     if night:
-        return int(clamp(int(base * DIM_FACTOR_NIGHT), 5, base))
-    return int(base)
+        value = int(clamp(int(base * DIM_FACTOR_NIGHT), 5, base))
+    else:
+        value = int(base)
+
+    next_hour = int(now) - lt.tm_min * 60 - lt.tm_sec + 3600
+    _bright_cache[:] = [next_hour, (base, autodim), value]
+    return value
 
 
 # =========================
@@ -613,6 +880,8 @@ def main():
     pc_cursor = 0
 
     frame = 0
+    last_pushed: Optional[bytes] = None
+    last_state: Optional[tuple] = None
 
     def save_dash_cfg():
         nonlocal cfg
@@ -627,39 +896,47 @@ def main():
         time.sleep(0.05)
         os.execv("/usr/bin/python3", ["python3", LAUNCHER_PATH])
 
-    def draw_page_1():
-        img.paste((0, 0, 0), (0, 0, W, H))
-
-        clk = time.strftime("%H:%M")
-        draw_centered_crisp(img, 2, clk, font_big, fill=(245, 245, 245))
-
-        date = time.strftime("%d.%m")
-        dow = time.strftime("%a").upper()
-        draw_centered_crisp(img, 20, f"{dow}  {date}", font_mid, fill=(170, 170, 170))
+    # Each page is split into "state" (cheap: strings/values shown) and "draw".
+    # The frame is only re-rendered when the full state tuple changes.
+    def page_1_state() -> tuple:
+        lt = time.localtime()
+        clk = time.strftime("%H:%M", lt)
+        date = time.strftime("%d.%m", lt)
+        dow = time.strftime("%a", lt).upper()
 
         weather.update(postcode)
+        w_ok, w_temp, w_kind, w_rain = weather.snapshot
 
         if not postcode:
             temp_str = "--°C"
             kind = "unknown"
             line = "POSTCODE?"
             rain_line = ""
-        elif not weather.ok:
+        elif not w_ok:
             temp_str = "--°C"
             kind = "unknown"
             line = "NO NET"
             rain_line = ""
         else:
-            temp_str = f"{weather.temp_c:>2d}°C"
-            kind = weather.kind
+            temp_str = f"{w_temp:>2d}°C"
+            kind = w_kind
             # rain chance line
-            if weather.rain_pct is None:
+            if w_rain is None:
                 rain_line = ""
             else:
-                rain_line = f"RAIN {weather.rain_pct:>2d}%"
+                rain_line = f"RAIN {w_rain:>2d}%"
             line = "WEATHER"
 
-        draw_icon(img, kind, 10, 30, frame)
+        return (0, clk, f"{dow}  {date}", kind, _icon_phase(kind, frame), temp_str, line, rain_line)
+
+    def draw_page_1(st: tuple):
+        _page, clk, dow_date, kind, _phase, temp_str, line, rain_line = st
+        img.paste((0, 0, 0), (0, 0, W, H))
+
+        draw_centered_crisp(img, 2, clk, font_big, fill=(245, 245, 245))
+        draw_centered_crisp(img, 20, dow_date, font_mid, fill=(170, 170, 170))
+
+        blit_icon(img, kind, 10, 30, frame)
         draw_text_crisp(img, (46, 36), temp_str, font_big, fill=(245, 245, 245))
         draw_text_crisp(img, (46, 52), line, font_mid, fill=(150, 150, 150))
 
@@ -668,27 +945,31 @@ def main():
 
         draw_text_crisp(img, (W - 16, H - 10), "1/2", font_small, fill=(90, 90, 90))
 
-    def draw_page_2():
-        img.paste((0, 0, 0), (0, 0, W, H))
-
+    def page_2_state() -> tuple:
         ip = get_ip() or "NO IP"
         t = cpu_temp_c()
         l = load_1m()
         ram = ram_used_pct()
         sd = disk_used_pct("/")
 
+        cpu_s = f"CPU {t:4.1f}C" if t is not None else "CPU --.-C"
+        load_s = f"L {l:.2f}" if l is not None else "L --"
+        ram_s = f"RAM {ram:3d}%" if ram is not None else "RAM ---%"
+        sd_s = f"SD {sd:3d}%" if sd is not None else "SD ---%"
+        return (1, cpu_s, load_s, ram_s, sd_s, ip, uptime_str())
+
+    def draw_page_2(st: tuple):
+        _page, cpu_s, load_s, ram_s, sd_s, ip, up = st
+        img.paste((0, 0, 0), (0, 0, W, H))
+
         draw_text_crisp(img, (4, 2), "SYSTEM", font_small, fill=(110, 110, 110))
         draw_text_crisp(img, (W - 16, 2), "2/2", font_small, fill=(90, 90, 90))
 
         y = 12
-        cpu_s = f"CPU {t:4.1f}C" if t is not None else "CPU --.-C"
-        load_s = f"L {l:.2f}" if l is not None else "L --"
         draw_text_crisp(img, (4, y), cpu_s, font_mid, fill=(235, 235, 235))
         draw_text_crisp(img, (72, y), load_s, font_mid, fill=(180, 180, 180))
 
         y += 10
-        ram_s = f"RAM {ram:3d}%" if ram is not None else "RAM ---%"
-        sd_s = f"SD {sd:3d}%" if sd is not None else "SD ---%"
         draw_text_crisp(img, (4, y), ram_s, font_mid, fill=(235, 235, 235))
         draw_text_crisp(img, (72, y), sd_s, font_mid, fill=(180, 180, 180))
 
@@ -698,17 +979,10 @@ def main():
         draw_text_crisp(img, (4, y), f"IP {ip_t}", font_mid, fill=(200, 200, 200))
 
         y += 12
-        up = "UP ?"
-        try:
-            with open("/proc/uptime", "r", encoding="utf-8") as f:
-                sec = float(f.read().split()[0])
-            days = int(sec // 86400)
-            hrs = int((sec % 86400) // 3600)
-            up = f"UP {days}d{hrs}h" if days > 0 else f"UP {hrs}h"
-        except Exception:
-            pass
         draw_text_crisp(img, (4, y), up, font_mid, fill=(150, 150, 150))
 
+    next_t = time.monotonic()
+
     try:
         while True:
             # apply auto dim live
@@ -722,7 +996,7 @@ def main():
             can_nav = (now - last_nav) >= NAV_REPEAT
 
             # open menu
-            if (ev.get("start") or ev.get("select")) and not menu_open:
+            if (ev & (EV_START | EV_SELECT)) and not menu_open:
                 menu_open = True
                 edit_postcode = False
                 menu_sel = 0
@@ -736,43 +1010,43 @@ def main():
                         pc.append("0")
                     pc = pc[:5]
 
-                    if can_nav and ev.get("left"):
+                    if can_nav and ev & EV_LEFT:
                         pc_cursor = max(0, pc_cursor - 1)
                         last_nav = now
-                    elif can_nav and ev.get("right"):
+                    elif can_nav and ev & EV_RIGHT:
                         pc_cursor = min(4, pc_cursor + 1)
                         last_nav = now
-                    elif can_nav and ev.get("up"):
+                    elif can_nav and ev & EV_UP:
                         dgt = int(pc[pc_cursor])
                         pc[pc_cursor] = str((dgt + 1) % 10)
                         last_nav = now
-                    elif can_nav and ev.get("down"):
+                    elif can_nav and ev & EV_DOWN:
                         dgt = int(pc[pc_cursor])
                         pc[pc_cursor] = str((dgt - 1) % 10)
                         last_nav = now
 
                     postcode = "".join(pc)
 
-                    if ev.get("ok"):
+                    if ev & EV_OK:
                         edit_postcode = False
                         save_dash_cfg()
 
-                    if ev.get("back"):
+                    if ev & EV_BACK:
                         edit_postcode = False
 
                 else:
                     # menu navigation
-                    if can_nav and ev.get("up"):
+                    if can_nav and ev & EV_UP:
                         menu_sel = max(0, menu_sel - 1)
                         last_nav = now
-                    elif can_nav and ev.get("down"):
+                    elif can_nav and ev & EV_DOWN:
                         menu_sel = min(len(MENU_ITEMS) - 1, menu_sel + 1)
                         last_nav = now
 
-                    if ev.get("back"):
+                    if ev & EV_BACK:
                         menu_open = False
 
-                    if ev.get("ok"):
+                    if ev & EV_OK:
                         item = MENU_ITEMS[menu_sel]
                         if item == "RETURN":
                             menu_open = False
@@ -791,11 +1065,11 @@ def main():
 
             else:
                 # Page change with DPAD L/R
-                if can_nav and ev.get("left"):
+                if can_nav and ev & EV_LEFT:
                     page = (page - 1) % 2
                     last_nav = now
                     last_page_switch = now
-                elif can_nav and ev.get("right"):
+                elif can_nav and ev & EV_RIGHT:
                     page = (page + 1) % 2
                     last_nav = now
                     last_page_switch = now
@@ -805,20 +1079,38 @@ def main():
                     page = (page + 1) % 2
                     last_page_switch = now
 
-            # Render
-            if page == 0:
-                draw_page_1()
-            else:
-                draw_page_2()
-
+            # Render only if something visible changed
+            st = page_1_state() if page == 0 else page_2_state()
             if menu_open:
-                draw_menu(img, font_small, menu_sel, postcode, autoscroll, autodim, edit_postcode, pc_cursor)
+                st += (menu_sel, postcode, autoscroll, autodim, edit_postcode, pc_cursor)
+
+            if st != last_state:
+                last_state = st
+                if page == 0:
+                    draw_page_1(st)
+                else:
+                    draw_page_2(st)
 
-            offscreen.SetImage(img, 0, 0)
-            offscreen = matrix.SwapOnVSync(offscreen)
+                if menu_open:
+                    draw_menu(img, font_small, menu_sel, postcode, autoscroll, autodim, edit_postcode, pc_cursor)
+
+                # identical frame -> keep the front buffer as is (the library keeps
+                # refreshing it); swapping would show the stale back buffer
+                data = img.tobytes()
+                if data != last_pushed:
+                    offscreen.SetImage(img, 0, 0)
+                    offscreen = matrix.SwapOnVSync(offscreen)
+                    last_pushed = data
 
             frame += 1
-            time.sleep(0.04)
+
+            # fixed 25 FPS deadline: render time is absorbed, not added
+            next_t += FRAME_PERIOD
+            slack = next_t - time.monotonic()
+            if slack > 0:
+                time.sleep(slack)
+            else:
+                next_t = time.monotonic()  # overrun -> resync, no catch-up burst
 
     finally:
         joy.stop()
@@ -1,8 +1,6 @@
 #!/usr/bin/env python3
-import os, sys, time, random, struct, threading, signal
-from dataclasses import dataclass
+import os, sys, time, random, struct, threading, signal, selectors, queue
 from typing import Tuple, Set, List, Dict
-from collections import deque
 
 from PIL import Image, ImageDraw
 from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -76,12 +74,30 @@ def load_hiscore() -> int:
         return 0
 
 def save_hiscore(v: int) -> None:
+    # write a temp file and rename over the old one: a power cut never leaves a torn file
+    tmp = HISCORE_PATH + ".tmp"
     try:
-        with open(HISCORE_PATH, "w", encoding="utf-8") as f:
+        with open(tmp, "w", encoding="utf-8") as f:
             f.write(str(int(v)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, HISCORE_PATH)
     except Exception:
         pass
 
+# cold-path disk writes run here so an fsync never lands inside a frame
+IO_QUEUE: "queue.Queue" = queue.Queue()
+
+def io_worker():
+    while True:
+        job = IO_QUEUE.get()
+        try:
+            job()
+        except Exception:
+            pass
+        finally:
+            IO_QUEUE.task_done()
+
 # ======================
 # MAP (28x31) - classic-like layout
 # ======================
@@ -134,6 +150,13 @@ GHOST_HOME_TILES = {
     "clyde":  (14, 15),
 }
 
+# ghost slots 0..N_GHOSTS-1 (game state keeps one list per field, indexed by slot)
+N_GHOSTS = len(GHOSTS)
+GHOST_COLS = [col for _, col in GHOSTS]
+GHOST_HOMES = [GHOST_HOME_TILES[name] for name, _ in GHOSTS]
+# points for the 1st..Nth ghost eaten on one power pellet (chain resets on every pellet)
+FRIGHT_SCORES = tuple(200 * (2 ** k) for k in range(N_GHOSTS))
+
 def compute_house_exit_tile() -> Tuple[int, int]:
     candidates = [(14,10),(13,10),(15,10),(14,9),(14,11)]
     for cx, cy in candidates:
@@ -143,6 +166,16 @@ def compute_house_exit_tile() -> Tuple[int, int]:
 
 HOUSE_EXIT_TILE = compute_house_exit_tile()
 
+# flat tile tables (index = cy*COLS + cx), built once from WALLMAP
+WALL_BITS = bytes(1 if WALLMAP[cy][cx] == "X" else 0 for cy in range(ROWS) for cx in range(COLS))
+GATE_BITS = bytes(1 if (cy == GATE_CY and cx in GATE_XS) else 0 for cy in range(ROWS) for cx in range(COLS))
+OPEN_PAC = bytes((not w) and (not g) for w, g in zip(WALL_BITS, GATE_BITS))
+OPEN_GHOST = bytes((not w) or bool(g) for w, g in zip(WALL_BITS, GATE_BITS))
+HOUSE_BITS = bytes(
+    1 if (HOUSE_X0 <= cx <= HOUSE_X1 and HOUSE_Y0 <= cy <= HOUSE_Y1) else 0
+    for cy in range(ROWS) for cx in range(COLS)
+)
+
 # ======================
 # SCALE / LAYOUT
 # ======================
@@ -158,18 +191,22 @@ HUD_X0 = MAZE_W + 1  # right side HUD separator (do not change)
 # ======================
 # INPUT
 # ======================
-@dataclass
-class NavEvent:
-    up: bool = False
-    down: bool = False
-    left: bool = False
-    right: bool = False
-    a: bool = False
-    b: bool = False
-    x: bool = False
-    y: bool = False
-    start: bool = False
-    select: bool = False
+# edge events as bits (pop() -> int); DPAD bits follow DIR_* order so bit_length()-1 is the dir
+EV_LEFT = 1
+EV_RIGHT = 2
+EV_UP = 4
+EV_DOWN = 8
+EV_A = 16
+EV_B = 32
+EV_X = 64
+EV_Y = 128
+EV_START = 256
+EV_SELECT = 512
+EV_DPAD = EV_LEFT | EV_RIGHT | EV_UP | EV_DOWN
+EVENT_BITS = {
+    "left": EV_LEFT, "right": EV_RIGHT, "up": EV_UP, "down": EV_DOWN,
+    "a": EV_A, "b": EV_B, "x": EV_X, "y": EV_Y, "start": EV_START, "select": EV_SELECT,
+}
 
 # Your controller mapping:
 BTN_X = 0
@@ -179,6 +216,11 @@ BTN_Y = 3
 BTN_SELECT = 8
 BTN_START  = 9
 
+BUTTON_BITS = {BTN_A: EV_A, BTN_B: EV_B, BTN_X: EV_X, BTN_Y: EV_Y, BTN_START: EV_START, BTN_SELECT: EV_SELECT}
+AXIS_BITS = ((EV_LEFT, EV_RIGHT), (EV_UP, EV_DOWN))  # axis num -> (negative, positive)
+
+JS_EVENT = struct.Struct("IhBB")  # time, value, type, number
+
 MENU_TOGGLE_FALLBACK_Y = False
 MENU_DEBOUNCE_SEC = 0.35
 
@@ -187,91 +229,137 @@ class Joystick(threading.Thread):
         super().__init__(daemon=True)
         self.path = path
         self.lock = threading.Lock()
-        self.ev = NavEvent()
+        self.ev = 0
+        self.pending = threading.Event()  # set when input arrived since the last pop()
         self.DEAD = 12000
         self._stop = False
+        # self-pipe: stop() wakes the reader's select() so it can block without a timeout
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
 
     def stop(self):
         self._stop = True
+        with self.lock:
+            if self._wake_w >= 0:
+                try:
+                    os.write(self._wake_w, b"\0")
+                except OSError:
+                    pass
+        if self.ident is None:
+            self._close_wake()  # thread never started: run() won't close it
+
+    def _close_wake(self):
+        # under the lock so stop() never writes to a closed (possibly reused) fd
+        with self.lock:
+            for fd in (self._wake_r, self._wake_w):
+                if fd >= 0:
+                    os.close(fd)
+            self._wake_r = self._wake_w = -1
 
-    def pop(self) -> NavEvent:
+    def wake(self):
+        """Release a pending wait() now (e.g. from a signal handler)."""
+        self.pending.set()
+
+    def pop(self) -> int:
+        """OR of all EV_* edges since the last call (0 if none)."""
         with self.lock:
             e = self.ev
-            self.ev = NavEvent()
+            self.ev = 0
+            self.pending.clear()
             return e
 
+    def wait(self, timeout: float) -> bool:
+        """Block until new input or timeout (main loop idles here between ticks)."""
+        return self.pending.wait(timeout)
+
+    def _handle(self, value: int, etype: int, num: int):
+        # caller holds self.lock
+        if etype & 0x80:
+            return
+        etype &= 0x7F
+
+        if etype == 0x02:  # axis
+            if num <= 1:
+                if value < -self.DEAD:
+                    self.ev |= AXIS_BITS[num][0]
+                elif value > self.DEAD:
+                    self.ev |= AXIS_BITS[num][1]
+
+        elif etype == 0x01 and value == 1:  # button press
+            self.ev |= BUTTON_BITS.get(num, 0)
+
+    def _handle_batch(self, data):
+        # whole events only (bytes or memoryview); parse in one C loop, take the lock once
+        handle = self._handle
+        with self.lock:
+            ev = self.ev
+            for _, value, etype, num in JS_EVENT.iter_unpack(data):
+                handle(value, etype, num)
+            if self.ev != ev:  # axis noise / releases: no new edge, don't wake the main loop
+                self.pending.set()
+
     def run(self):
+        try:
+            self._read_loop()
+        finally:
+            self._close_wake()
+
+    def _read_loop(self):
         if not os.path.exists(self.path):
             return
-        fmt = "IhBB"
-        sz = struct.calcsize(fmt)
         try:
-            with open(self.path, "rb", buffering=0) as f:
-                while not self._stop:
-                    data = f.read(sz)
-                    if not data or len(data) != sz:
-                        time.sleep(0.01)
-                        continue
-                    _, value, etype, num = struct.unpack(fmt, data)
-                    if etype & 0x80:
-                        continue
-                    etype &= 0x7F
-
-                    with self.lock:
-                        if etype == 0x02:  # axis
-                            if num == 0:
-                                if value < -self.DEAD:
-                                    self.ev.left = True
-                                elif value > self.DEAD:
-                                    self.ev.right = True
-                            elif num == 1:
-                                if value < -self.DEAD:
-                                    self.ev.up = True
-                                elif value > self.DEAD:
-                                    self.ev.down = True
-
-                        elif etype == 0x01 and value == 1:  # button press
-                            if num == BTN_A: self.ev.a = True
-                            elif num == BTN_B: self.ev.b = True
-                            elif num == BTN_X: self.ev.x = True
-                            elif num == BTN_Y: self.ev.y = True
-                            elif num == BTN_START: self.ev.start = True
-                            elif num == BTN_SELECT: self.ev.select = True
+            fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return
+        sel = selectors.DefaultSelector()
+        sel.register(fd, selectors.EVENT_READ)
+        sel.register(self._wake_r, selectors.EVENT_READ)
+        # one reusable read buffer; memoryview slices hand it to iter_unpack without copies
+        buf = bytearray(JS_EVENT.size * 64)
+        mv = memoryview(buf)
+        try:
+            while not self._stop:
+                # sleep in the kernel until js0 has data or stop() writes the wake pipe
+                sel.select()
+                if self._stop:
+                    break
+                # drain everything queued, then wait again
+                while True:
+                    try:
+                        n = os.readv(fd, [buf])
+                    except BlockingIOError:
+                        break
+                    if n <= 0:
+                        return  # device gone
+                    self._handle_batch(mv[:n - n % JS_EVENT.size])
         except Exception:
             return
+        finally:
+            sel.close()
+            os.close(fd)
 
 # ======================
 # MAZE HELPERS
 # ======================
-DIRS = {"L": (-1, 0), "R": (1, 0), "U": (0, -1), "D": (0, 1)}
-DIR_LIST = list(DIRS.values())
-
-def in_bounds(cx: int, cy: int) -> bool:
-    return 0 <= cx < COLS and 0 <= cy < ROWS
-
-def is_wall(cx: int, cy: int) -> bool:
-    if not in_bounds(cx, cy):
-        return True
-    return WALLMAP[cy][cx] == "X"
-
-def is_gate_tile(cx: int, cy: int) -> bool:
-    return (cy == GATE_CY) and (cx in GATE_XS)
-
-def in_house(cx: int, cy: int) -> bool:
-    return HOUSE_X0 <= cx <= HOUSE_X1 and HOUSE_Y0 <= cy <= HOUSE_Y1
+# directions as small ints; reverse of d is d ^ 1, DIR_NONE = standing still
+DIR_L, DIR_R, DIR_U, DIR_D, DIR_NONE = 0, 1, 2, 3, 4
+DX = (-1, 1, 0, 0, 0)
+DY = (0, 0, -1, 1, 0)
 
 def is_open_for_pac(cx: int, cy: int) -> bool:
-    if is_gate_tile(cx, cy):
-        return False
-    return not is_wall(cx, cy)
+    return 0 <= cx < COLS and 0 <= cy < ROWS and OPEN_PAC[cy * COLS + cx] == 1
 
 def is_open_for_ghost(cx: int, cy: int) -> bool:
-    return (not is_wall(cx, cy)) or is_gate_tile(cx, cy)
+    return 0 <= cx < COLS and 0 <= cy < ROWS and OPEN_GHOST[cy * COLS + cx] == 1
+
+# pixel centers per column / row
+CENTER_X = tuple(OX + cx * CELL_X + (CELL_X // 2) for cx in range(COLS))
+CENTER_Y = tuple(OY + cy * CELL_Y + (CELL_Y // 2) for cy in range(ROWS))
 
 def cell_center(cx: int, cy: int) -> Tuple[int, int]:
-    x = OX + cx * CELL_X + (CELL_X // 2)
-    y = OY + cy * CELL_Y + (CELL_Y // 2)
-    return x, y
+    return CENTER_X[cx], CENTER_Y[cy]
+
+HOUSE_EXIT_X, HOUSE_EXIT_Y = cell_center(*HOUSE_EXIT_TILE)
 
 def px_to_cell(px: int, py: int) -> Tuple[int, int]:
     cx = int(round((px - (OX + (CELL_X // 2))) / CELL_X))
@@ -280,14 +368,43 @@ def px_to_cell(px: int, py: int) -> Tuple[int, int]:
     cy = max(0, min(ROWS - 1, cy))
     return cx, cy
 
-def is_at_tile_center(px: int, py: int) -> bool:
-    cx, cy = px_to_cell(px, py)
-    tx, ty = cell_center(cx, cy)
-    return px == tx and py == ty
+# tile centre test: every centerline pixel lies inside the grid, so
+# (p - O) % CELL == CELL_HALF on both axes decides it
+CELL_HALF_X = CELL_X // 2
+CELL_HALF_Y = CELL_Y // 2
 
 def collide(px: int, py: int, gx: int, gy: int, r: int = 1) -> bool:
     return abs(px - gx) <= r and abs(py - gy) <= r
 
+# per-tile connectivity flags (index = cy*COLS + cx), shared by maze render + centerline build
+TF_OPEN       = 1   # corridor or gate (open for ghosts)
+TF_PAC        = 2   # open for pacman
+TF_RIGHT      = 4   # right neighbour open for ghosts
+TF_DOWN       = 8   # lower neighbour open for ghosts
+TF_RIGHT_PAC  = 16  # this + right neighbour open for pacman
+TF_DOWN_PAC   = 32  # this + lower neighbour open for pacman
+
+def build_tile_flags() -> bytes:
+    out = bytearray(ROWS * COLS)
+    for cy in range(ROWS):
+        for cx in range(COLS):
+            if not is_open_for_ghost(cx, cy):
+                continue
+            pac = is_open_for_pac(cx, cy)
+            f = TF_OPEN | (TF_PAC if pac else 0)
+            if cx + 1 < COLS and is_open_for_ghost(cx + 1, cy):
+                f |= TF_RIGHT
+                if pac and is_open_for_pac(cx + 1, cy):
+                    f |= TF_RIGHT_PAC
+            if cy + 1 < ROWS and is_open_for_ghost(cx, cy + 1):
+                f |= TF_DOWN
+                if pac and is_open_for_pac(cx, cy + 1):
+                    f |= TF_DOWN_PAC
+            out[cy * COLS + cx] = f
+    return bytes(out)
+
+TILE_FLAGS = build_tile_flags()
+
 # ======================
 # RENDER MAZE
 # ======================
@@ -295,20 +412,20 @@ def draw_maze_visual(img: Image.Image) -> None:
     d = ImageDraw.Draw(img)
     d.rectangle((0, 0, MAZE_W, H), fill=WALL)
 
-    for cy in range(ROWS):
-        for cx in range(COLS):
-            if is_wall(cx, cy) and not is_gate_tile(cx, cy):
-                continue
-            x, y = cell_center(cx, cy)
-            d.rectangle((x - BAND_R, y - BAND_R, x + BAND_R, y + BAND_R), fill=BLACK)
+    for i, f in enumerate(TILE_FLAGS):
+        if not f:
+            continue
+        cy, cx = divmod(i, COLS)
+        x, y = CENTER_X[cx], CENTER_Y[cy]
+        d.rectangle((x - BAND_R, y - BAND_R, x + BAND_R, y + BAND_R), fill=BLACK)
 
-            if cx + 1 < COLS and is_open_for_ghost(cx + 1, cy):
-                xr, _ = cell_center(cx + 1, cy)
-                d.rectangle((min(x, xr), y - BAND_R, max(x, xr), y + BAND_R), fill=BLACK)
+        if f & TF_RIGHT:
+            xr = CENTER_X[cx + 1]
+            d.rectangle((min(x, xr), y - BAND_R, max(x, xr), y + BAND_R), fill=BLACK)
 
-            if cy + 1 < ROWS and is_open_for_ghost(cx, cy + 1):
-                _, yd = cell_center(cx, cy + 1)
-                d.rectangle((x - BAND_R, min(y, yd), x + BAND_R, max(y, yd)), fill=BLACK)
+        if f & TF_DOWN:
+            yd = CENTER_Y[cy + 1]
+            d.rectangle((x - BAND_R, min(y, yd), x + BAND_R, max(y, yd)), fill=BLACK)
 
     for cx in GATE_XS:
         gx, gy = cell_center(cx, GATE_CY)
@@ -318,46 +435,54 @@ def draw_maze_visual(img: Image.Image) -> None:
 # CENTERLINE MASKS
 # ======================
 def build_centerline_masks():
-    pac = [[False] * W for _ in range(H)]
-    ghost = [[False] * W for _ in range(H)]
-
-    def setpix(mask, x, y):
-        if 0 <= x < W and 0 <= y < H and x < MAZE_W:
-            mask[y][x] = True
+    """
+    Returns (pac, ghost) as flat W*H bytearrays (index y*W + x),
+    1 = pixel lies on a walkable centerline.
+    """
+    pac = bytearray(W * H)
+    ghost = bytearray(W * H)
+
+    def span(mask, x0, y0, x1, y1):
+        # inclusive horizontal/vertical run, clipped to the maze area
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(MAZE_W - 1, W - 1, x1), min(H - 1, y1)
+        if x0 > x1 or y0 > y1:
+            return
+        if y0 == y1:
+            mask[y0 * W + x0:y0 * W + x1 + 1] = b"\x01" * (x1 - x0 + 1)
+        else:
+            mask[y0 * W + x0:y1 * W + x0 + 1:W] = b"\x01" * (y1 - y0 + 1)
 
-    for cy in range(ROWS):
-        for cx in range(COLS):
-            if is_wall(cx, cy) and not is_gate_tile(cx, cy):
-                continue
-            x, y = cell_center(cx, cy)
+    for i, f in enumerate(TILE_FLAGS):
+        if not f:
+            continue
+        cy, cx = divmod(i, COLS)
+        x, y = CENTER_X[cx], CENTER_Y[cy]
 
-            if is_open_for_pac(cx, cy):
-                setpix(pac, x, y)
-            if is_open_for_ghost(cx, cy):
-                setpix(ghost, x, y)
+        if f & TF_PAC:
+            span(pac, x, y, x, y)
+        span(ghost, x, y, x, y)
 
-            if cx + 1 < COLS and is_open_for_ghost(cx + 1, cy):
-                x2, _ = cell_center(cx + 1, cy)
-                for xx in range(min(x, x2), max(x, x2) + 1):
-                    if is_open_for_pac(cx, cy) and is_open_for_pac(cx + 1, cy):
-                        setpix(pac, xx, y)
-                    setpix(ghost, xx, y)
+        if f & TF_RIGHT:
+            x2 = CENTER_X[cx + 1]
+            if f & TF_RIGHT_PAC:
+                span(pac, min(x, x2), y, max(x, x2), y)
+            span(ghost, min(x, x2), y, max(x, x2), y)
 
-            if cy + 1 < ROWS and is_open_for_ghost(cx, cy + 1):
-                _, y2 = cell_center(cx, cy + 1)
-                for yy in range(min(y, y2), max(y, y2) + 1):
-                    if is_open_for_pac(cx, cy) and is_open_for_pac(cx, cy + 1):
-                        setpix(pac, x, yy)
-                    setpix(ghost, x, yy)
+        if f & TF_DOWN:
+            y2 = CENTER_Y[cy + 1]
+            if f & TF_DOWN_PAC:
+                span(pac, x, min(y, y2), x, max(y, y2))
+            span(ghost, x, min(y, y2), x, max(y, y2))
 
     for cx in GATE_XS:
         x, y = cell_center(cx, GATE_CY)
-        setpix(ghost, x, y)
+        span(ghost, x, y, x, y)
 
     return pac, ghost
 
 def can_stand(mask, x, y) -> bool:
-    return 0 <= x < W and 0 <= y < H and mask[y][x]
+    return 0 <= x < W and 0 <= y < H and mask[y * W + x] == 1
 
 # ======================
 # TUNNEL WRAP
@@ -367,37 +492,82 @@ for cy in range(ROWS):
     if is_open_for_ghost(0, cy) and is_open_for_ghost(COLS - 1, cy):
         TUNNEL_ROWS.add(cy)
 
+# per pixel row: center y of its tile row when that row is a tunnel, else -1
+TUNNEL_Y = tuple(
+    CENTER_Y[cy] if cy in TUNNEL_ROWS else -1
+    for cy in (px_to_cell(0, py)[1] for py in range(H))
+)
+TUNNEL_LX, TUNNEL_RX = CENTER_X[0], CENTER_X[COLS - 1]
+
 def tunnel_wrap_on_centerline(x: int, y: int, dirx: int) -> Tuple[int, int]:
-    cx, cy = px_to_cell(x, y)
-    if cy not in TUNNEL_ROWS:
+    ty = TUNNEL_Y[y] if 0 <= y < H else -1
+    if ty < 0:
         return x, y
-    lx, ly = cell_center(0, cy)
-    rx, ry = cell_center(COLS - 1, cy)
-    y = ly
-    if dirx < 0 and x <= lx:
-        return rx, ry
-    if dirx > 0 and x >= rx:
-        return lx, ly
-    return x, y
+    if dirx < 0 and x <= TUNNEL_LX:
+        return TUNNEL_RX, ty
+    if dirx > 0 and x >= TUNNEL_RX:
+        return TUNNEL_LX, ty
+    return x, ty
+
+# ======================
+# MOVEMENT
+# ======================
+def move_along(mask, x: int, y: int, d: int, acc: int, drain: bool) -> Tuple[int, int, int]:
+    """
+    Spend the whole pixels of acc (Q8 fixed point, 256 = 1px) moving x,y in direction d
+    along mask (with tunnel wrap). When blocked: drain=True burns the remaining steps
+    (pacman), drain=False keeps them banked for the next tick (ghosts).
+    """
+    dx, dy = DX[d], DY[d]
+    steps = acc >> 8
+    acc &= 0xFF
+    while steps:
+        steps -= 1
+        if dx != 0:
+            x, y = tunnel_wrap_on_centerline(x, y, dx)
+        nx, ny = x + dx, y + dy
+        if can_stand(mask, nx, ny):
+            x, y = nx, ny
+        elif not drain:
+            return x, y, acc + (steps << 8)
+    return x, y, acc
 
 # ======================
 # PELLETS
 # ======================
-def flood_reachable(start: Tuple[int, int]) -> Set[Tuple[int, int]]:
+def flood_reachable(start: Tuple[int, int]) -> bytearray:
+    """
+    BFS over OPEN_PAC on flat tile indices (cy*COLS + cx).
+    Returns a ROWS*COLS visited mask (1 = reachable from start).
+    """
+    # globals -> locals: the loop body is all LOAD_FAST
+    open_pac, cols = OPEN_PAC, COLS
     sx, sy = start
+    seen = bytearray(ROWS * cols)
     if not is_open_for_pac(sx, sy):
-        return set()
-    q = deque([(sx, sy)])
-    seen = {(sx, sy)}
-    while q:
-        x, y = q.popleft()
-        for dx, dy in DIR_LIST:
-            nx, ny = x + dx, y + dy
-            if (nx, ny) in seen:
-                continue
-            if in_bounds(nx, ny) and is_open_for_pac(nx, ny):
-                seen.add((nx, ny))
-                q.append((nx, ny))
+        return seen
+    i = sy * cols + sx
+    seen[i] = 1
+    q = [i]
+    push = q.append
+    head = 0
+    last_row = (ROWS - 1) * cols
+    while head < len(q):
+        i = q[head]
+        head += 1
+        x = i % cols
+        if x > 0 and not seen[i - 1] and open_pac[i - 1]:
+            seen[i - 1] = 1
+            push(i - 1)
+        if x < cols - 1 and not seen[i + 1] and open_pac[i + 1]:
+            seen[i + 1] = 1
+            push(i + 1)
+        if i >= cols and not seen[i - cols] and open_pac[i - cols]:
+            seen[i - cols] = 1
+            push(i - cols)
+        if i < last_row and not seen[i + cols] and open_pac[i + cols]:
+            seen[i + cols] = 1
+            push(i + cols)
     return seen
 
 def pick_start_tile_pac() -> Tuple[int, int]:
@@ -407,18 +577,17 @@ def pick_start_tile_pac() -> Tuple[int, int]:
             return cx, cy
     return (1, 1)
 
-def build_pellets(reachable: Set[Tuple[int, int]]) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
-    pellets: Set[Tuple[int, int]] = set()
-    power: Set[Tuple[int, int]] = set()
-    for (cx, cy) in reachable:
-        if in_house(cx, cy):
-            continue
-        pellets.add((cx, cy))
-    candidates = [(1, 3), (COLS - 2, 3), (1, 23), (COLS - 2, 23)]
-    for c in candidates:
-        if c in reachable:
-            pellets.discard(c)
-            power.add(c)
+POWER_TILES = [(1, 3), (COLS - 2, 3), (1, 23), (COLS - 2, 23)]
+POWER_IDX = tuple(cy * COLS + cx for cx, cy in POWER_TILES)
+
+def build_pellets(reachable: bytearray) -> Tuple[bytearray, bytearray]:
+    """Pellet / power bitsets over flat tile indices (1 = still on the board)."""
+    pellets = bytearray(r and not h for r, h in zip(reachable, HOUSE_BITS))
+    power = bytearray(ROWS * COLS)
+    for i in POWER_IDX:
+        if reachable[i]:
+            pellets[i] = 0
+            power[i] = 1
     return pellets, power
 
 # ======================
@@ -481,13 +650,38 @@ FONT_3x5 = {
 "V":["# #","# #","# #","# #"," # "],
 }
 
+# FONT_3x5 is constant: lit-pixel offsets and 1-bit masks for every glyph are built at import
+FONT_3x5_PIX = {
+    ch: [(xx, yy) for yy, row in enumerate(pat) for xx, c in enumerate(row) if c == "#"]
+    for ch, pat in FONT_3x5.items()
+}
+# rotated 90deg clockwise: 3 rows x 5 cols
+FONT_3x5_ROT = {
+    ch: [(xx, yy) for yy in range(3) for xx in range(5) if pat[4 - xx][yy] == "#"]
+    for ch, pat in FONT_3x5.items()
+}
+
+def build_glyph_mask(pixels: List[Tuple[int, int]], size: Tuple[int, int]) -> Image.Image:
+    m = Image.new("1", size, 0)
+    for p in pixels:
+        m.putpixel(p, 1)
+    return m
+
+GLYPHS = {
+    ch: build_glyph_mask(FONT_3x5_PIX[ch], (max(len(row) for row in pat), len(pat)))
+    for ch, pat in FONT_3x5.items()
+}
+GLYPHS_V = {ch: build_glyph_mask(px, (5, 3)) for ch, px in FONT_3x5_ROT.items()}
+# bold = second pass 1px to the right
+GLYPHS_V_BOLD = {
+    ch: build_glyph_mask(px + [(xx + 1, yy) for xx, yy in px], (6, 3))
+    for ch, px in FONT_3x5_ROT.items()
+}
+
 def draw_text_3x5(d: ImageDraw.ImageDraw, x: int, y: int, s: str, color=TXT, spacing: int=1):
+    blank = GLYPHS[" "]
     for ch in s:
-        pat = FONT_3x5.get(ch, FONT_3x5[" "])
-        for yy, row in enumerate(pat):
-            for xx, c in enumerate(row):
-                if c == "#":
-                    d.point((x+xx, y+yy), fill=color)
+        d.bitmap((x, y), GLYPHS.get(ch, blank), fill=color)
         x += 3 + spacing
 
 def draw_text_3x5_v(d: ImageDraw.ImageDraw, x: int, y: int, s: str, color=TXT, spacing: int=1, bold: bool=True):
@@ -496,30 +690,18 @@ def draw_text_3x5_v(d: ImageDraw.ImageDraw, x: int, y: int, s: str, color=TXT, s
     Each char becomes 5x3 pixels, stacked downward.
     bold=True draws a second pass 1px to the right for better LED readability.
     """
+    glyphs = GLYPHS_V_BOLD if bold else GLYPHS_V
+    blank = glyphs[" "]
     for ch in s:
-        pat = FONT_3x5.get(ch, FONT_3x5[" "])
-
-        # rotate 90° clockwise: new is 3 rows x 5 cols
-        rot = []
-        for ry in range(3):
-            row = []
-            for rx in range(5):
-                row.append(pat[4 - rx][ry])
-            rot.append(row)
-
-        for yy in range(3):
-            for xx in range(5):
-                if rot[yy][xx] == "#":
-                    d.point((x + xx, y + yy), fill=color)
-                    if bold:
-                        d.point((x + xx + 1, y + yy), fill=color)
-
+        d.bitmap((x, y), glyphs.get(ch, blank), fill=color)
         y += 3 + spacing
 
-def draw_hud(d: ImageDraw.ImageDraw, score: int, hiscore: int, lives: int, tsec: int, level: int):
+def draw_hud_panel(d: ImageDraw.ImageDraw):
     d.rectangle((HUD_X0, 0, W-1, H-1), fill=HUD_BG)
     d.line((HUD_X0, 0, HUD_X0, H-1), fill=HUD_LINE)
 
+def draw_hud(d: ImageDraw.ImageDraw, score: int, hiscore: int, lives: int, tsec: int, level: int):
+    """HUD text only; the panel itself is part of MAZE_BG."""
     hud_w = W - HUD_X0
     # rotated glyph width ~5, bold adds +1 -> 6
     text_w = 6
@@ -538,57 +720,125 @@ def draw_hud(d: ImageDraw.ImageDraw, score: int, hiscore: int, lives: int, tsec:
     # TIME (seconds, 5 digits)
     draw_text_3x5_v(d, x, 60, f"{max(0,tsec)%100000:05d}", color=HUD_DIM, spacing=1, bold=True)
 
+# ======================
+# STATIC BACKGROUND (maze + HUD panel, rendered once)
+# ======================
+MAZE_BG = Image.new("RGB", (W, H), BLACK)
+draw_maze_visual(MAZE_BG)
+draw_hud_panel(ImageDraw.Draw(MAZE_BG))
+
 # ======================
 # SPRITES
 # ======================
-def draw_pellets_img(d: ImageDraw.ImageDraw, pellets: Set[Tuple[int, int]]):
-    for cx, cy in pellets:
-        x, y = cell_center(cx, cy)
-        d.point((x, y), fill=PEL)
+# pixel center of every flat tile index
+TILE_PX = [cell_center(i % COLS, i // COLS) for i in range(ROWS * COLS)]
+
+def draw_pellets_img(d: ImageDraw.ImageDraw, pellets: bytearray):
+    pts = [TILE_PX[i] for i, v in enumerate(pellets) if v]
+    if pts:
+        d.point(pts, fill=PEL)
 
-def draw_power_img(d: ImageDraw.ImageDraw, power: Set[Tuple[int, int]], blink_on: bool):
+def build_board(pellets: bytearray) -> Image.Image:
+    """MAZE_BG + pellet layer, built per level and patched by erase_pellet when one is eaten."""
+    board = MAZE_BG.copy()
+    draw_pellets_img(ImageDraw.Draw(board), pellets)
+    return board
+
+def erase_pellet(board: Image.Image, ti: int) -> None:
+    xy = TILE_PX[ti]
+    board.putpixel(xy, MAZE_BG.getpixel(xy))
+
+def draw_power_img(d: ImageDraw.ImageDraw, power: bytearray, blink_on: bool):
     if not blink_on:
         return
-    for cx, cy in power:
-        x, y = cell_center(cx, cy)
-        d.point((x, y), fill=PWR)
-        d.point((x + 1, y), fill=PWR)
-        d.point((x, y + 1), fill=PWR)
-        d.point((x + 1, y + 1), fill=PWR)
-
-def draw_pacman(d: ImageDraw.ImageDraw, x: int, y: int, mouth_open: bool, direction: Tuple[int, int]):
-    r = 2
-    d.ellipse((x - r, y - r, x + r, y + r), fill=PAC)
-    if not mouth_open:
-        return
-    dx, dy = direction
-    if dx == 1:
-        for p in [(x+1,y),(x+2,y-1),(x+2,y),(x+2,y+1)]: d.point(p, fill=BLACK)
-    elif dx == -1:
-        for p in [(x-1,y),(x-2,y-1),(x-2,y),(x-2,y+1)]: d.point(p, fill=BLACK)
-    elif dy == 1:
-        for p in [(x,y+1),(x-1,y+2),(x,y+2),(x+1,y+2)]: d.point(p, fill=BLACK)
-    elif dy == -1:
-        for p in [(x,y-1),(x-1,y-2),(x,y-2),(x+1,y-2)]: d.point(p, fill=BLACK)
-
-def draw_ghost(d: ImageDraw.ImageDraw, x: int, y: int, col, frightened: bool):
-    body = FRIGHT if frightened else col
-    pattern = ["01110","11111","11111","11111","10101"]
-    for ry, row in enumerate(pattern):
-        py = y - 2 + ry
-        for rx, c in enumerate(row):
-            if c == "1":
-                d.point((x - 2 + rx, py), fill=body)
-    d.point((x - 1, y - 1), fill=BLACK)
-    d.point((x + 1, y - 1), fill=BLACK)
+    # only the POWER_IDX tiles can hold one: no scan over the whole maze per frame
+    for i in POWER_IDX:
+        if not power[i]:
+            continue
+        x, y = TILE_PX[i]
+        d.rectangle((x, y, x + 1, y + 1), fill=PWR)
+
+# mouth wedge offsets per facing direction
+MOUTH_PX = (
+    ((-1, 0), (-2, -1), (-2, 0), (-2, 1)),  # DIR_L
+    ((1, 0), (2, -1), (2, 0), (2, 1)),      # DIR_R
+    ((0, -1), (-1, -2), (0, -2), (1, -2)),  # DIR_U
+    ((0, 1), (-1, 2), (0, 2), (1, 2)),      # DIR_D
+    (),                                     # DIR_NONE
+)
+
+# ======================
+# SPRITE TILES (5x5, centered on x,y; pre-rendered once, pasted through a 1-bit mask)
+# ======================
+def build_sprite(paint) -> Tuple[Image.Image, Image.Image]:
+    """paint(draw, fill_or_None) draws the sprite; run once for colour, once for the mask."""
+    rgb = Image.new("RGB", (5, 5), BLACK)
+    mask = Image.new("1", (5, 5), 0)
+    paint(ImageDraw.Draw(rgb), None)
+    paint(ImageDraw.Draw(mask), 1)
+    return rgb, mask
+
+def pacman_sprite(direction: int, mouth_open: bool):
+    def paint(d, ink):
+        d.ellipse((0, 0, 4, 4), fill=ink or PAC)
+        if mouth_open and MOUTH_PX[direction]:
+            d.point([(2 + ox, 2 + oy) for ox, oy in MOUTH_PX[direction]], fill=ink or BLACK)
+    return build_sprite(paint)
+
+# index: direction*2 + mouth_open
+PAC_TILES = [pacman_sprite(dr, mo) for dr in range(5) for mo in (False, True)]
+
+def draw_pacman(img: Image.Image, x: int, y: int, mouth_open: bool, direction: int):
+    rgb, mask = PAC_TILES[direction * 2 + mouth_open]
+    img.paste(rgb, (x - 2, y - 2), mask)
+
+# ======================
+# DIRTY RECTS (crop/paste boxes, right/bottom exclusive)
+# ======================
+def sprite_box(x: int, y: int) -> Tuple[int, int, int, int]:
+    return (x - 2, y - 2, x + 3, y + 3)
+
+def incl_box(b: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    return (b[0], b[1], b[2] + 1, b[3] + 1)
+
+READY_BOX = (30, 26, 98, 38)
+OUCH_BOX = (28, 26, 100, 38)
+HUD_BOX = (HUD_X0 + 1, 0, W, H)
+POWER_BOXES = [(x, y, x + 2, y + 2) for x, y in (cell_center(cx, cy) for cx, cy in POWER_TILES)]
+
+# HUD + power pellets never sit on the pellet layer, so their background is cut
+# from MAZE_BG once instead of cropped from the board per frame
+HUD_BG_TILE = MAZE_BG.crop(HUD_BOX)
+STATIC_BG = [(MAZE_BG.crop(b), b) for b in POWER_BOXES]
+READY_RESTORE = incl_box(READY_BOX)
+OUCH_RESTORE = incl_box(OUCH_BOX)
+
+GHOST_PATTERN = ["01110","11111","11111","11111","10101"]
+GHOST_BODY_PX = [(rx - 2, ry - 2) for ry, row in enumerate(GHOST_PATTERN) for rx, c in enumerate(row) if c == "1"]
+GHOST_EYES_PX = [(-1, -1), (1, -1)]
+
+def ghost_sprite(body):
+    def paint(d, ink):
+        d.point([(2 + ox, 2 + oy) for ox, oy in GHOST_BODY_PX], fill=ink or body)
+        d.point([(2 + ox, 2 + oy) for ox, oy in GHOST_EYES_PX], fill=ink or BLACK)
+    return build_sprite(paint)
+
+# index: slot*2 + frightened
+GHOST_TILES = [ghost_sprite(FRIGHT if fr else col) for col in GHOST_COLS for fr in (False, True)]
+
+def draw_ghost(img: Image.Image, x: int, y: int, slot: int, frightened: bool):
+    rgb, mask = GHOST_TILES[slot * 2 + frightened]
+    img.paste(rgb, (x - 2, y - 2), mask)
 
 # ======================
 # MENU
 # ======================
 MENU_ITEMS = ["RESUME", "RESTART", "EXIT"]
+MENU_BOX = (18, 12, 100, 46)
+MENU_RESTORE = incl_box(MENU_BOX)
 
 def draw_menu_overlay(d: ImageDraw.ImageDraw, idx: int):
-    x0, y0, x1, y1 = 18, 12, 100, 46
+    x0, y0, x1, y1 = MENU_BOX
     d.rectangle((x0, y0, x1, y1), outline=DIM, fill=BLACK)
 
     base_y = y0 + 6
@@ -618,56 +868,120 @@ def exec_launcher_or_exit(matrix: RGBMatrix):
 # ======================
 # GHOST AI (intersection-based)
 # ======================
-def ghost_possible_dirs(mask, x: int, y: int) -> List[Tuple[int,int]]:
+def build_dir_masks(mask) -> bytearray:
+    """Per-pixel 4-bit mask (bit d = direction d) of standable neighbours, built once."""
+    w, h = W, H
+    out = bytearray(w * h)
+    for i in range(w * h):
+        y, x = divmod(i, w)
+        m = 0
+        if x > 0 and mask[i - 1]:
+            m |= 1 << DIR_L
+        if x < w - 1 and mask[i + 1]:
+            m |= 1 << DIR_R
+        if y > 0 and mask[i - w]:
+            m |= 1 << DIR_U
+        if y < h - 1 and mask[i + w]:
+            m |= 1 << DIR_D
+        out[i] = m
+    return out
+
+def ghost_possible_dirs(dir_mask, x: int, y: int) -> int:
+    if not (0 <= x < W and 0 <= y < H):
+        return 0
+    return dir_mask[y * W + x]
+
+def build_dir_choices() -> List[Tuple[int, ...]]:
+    """[mask*5 + current dir] -> candidate dirs; reverse only as dead-end fallback."""
     out = []
-    for dx, dy in DIR_LIST:
-        if can_stand(mask, x + dx, y + dy):
-            out.append((dx, dy))
+    for m in range(16):
+        open_dirs = tuple(d for d in range(4) if (m >> d) & 1)
+        for gdir in range(5):
+            rev = gdir ^ 1 if gdir != DIR_NONE else DIR_NONE
+            out.append(tuple(d for d in open_dirs if d != rev) or open_dirs)
     return out
 
-def ghost_choose_dir(gx: int, gy: int, gdir: Tuple[int,int], target_px: Tuple[int,int], frightened: bool, mask) -> Tuple[int,int]:
-    dirs = ghost_possible_dirs(mask, gx, gy)
-    if not dirs:
-        return (0, 0)
-    rev = (-gdir[0], -gdir[1])
-    choices = [d for d in dirs if d != rev] or dirs
-    tx, ty = target_px
+DIR_CHOICES = build_dir_choices()
+
+def rank_dirs(choices: Tuple[int, ...], ex: int, ey: int, frightened: bool) -> Tuple[int, int]:
+    """
+    Best + runner-up of choices by Manhattan distance to a target offset (ex, ey)
+    (farthest first when frightened); first wins on ties, like a stable sort.
+    """
+    best = second = DIR_NONE
+    best_md = second_md = 0
+    for d in choices:
+        md = abs(ex - DX[d]) + abs(ey - DY[d])
+        if frightened:
+            md = -md
+        if best == DIR_NONE or md < best_md:
+            second, second_md = best, best_md
+            best, best_md = d, md
+        elif second == DIR_NONE or md < second_md:
+            second, second_md = d, md
+    return best, second
+
+def build_ghost_picks() -> List[Tuple[int, int]]:
+    """
+    One step changes the Manhattan distance by exactly +-1 per axis, so the ranking
+    only depends on the signs of the target offset. All 4 candidates are scored here
+    once for every (mask, dir, sign x, sign y, frightened).
+    """
+    out = []
+    for choices in DIR_CHOICES:
+        for sx in (-1, 0, 1):
+            for sy in (-1, 0, 1):
+                for frightened in (False, True):
+                    out.append(rank_dirs(choices, sx, sy, frightened))
+    return out
 
-    def score_dir(d):
-        nx = gx + d[0]
-        ny = gy + d[1]
-        md = abs(tx - nx) + abs(ty - ny)
-        return -md if frightened else md
+# index: ((mask*5 + dir)*9 + (sx+1)*3 + (sy+1))*2 + frightened
+GHOST_PICKS = build_ghost_picks()
 
-    choices.sort(key=score_dir)
-    if len(choices) > 1 and random.random() < (0.25 if not frightened else 0.10):
-        return random.choice(choices[:2])
-    return choices[0]
+def ghost_choose_dir(gx: int, gy: int, gdir: int, tx: int, ty: int, frightened: bool, dir_mask) -> int:
+    ex = tx - gx
+    ey = ty - gy
+    k = (ghost_possible_dirs(dir_mask, gx, gy) * 5 + gdir) * 9 + ((ex > 0) - (ex < 0) + 1) * 3 + ((ey > 0) - (ey < 0) + 1)
+    best, second = GHOST_PICKS[k * 2 + frightened]
+    if second == DIR_NONE:
+        return best
+    if random.random() < (0.25 if not frightened else 0.10):
+        return random.choice((best, second))
+    return best
 
 # ======================
 # GAME STATE
 # ======================
+PAC_SPEED_BASE = 24.0  # px/s
+
+# (pacman, ghost) speed per level in Q8 px/s (index level-1); ghosts speed up 10%/level, max 2x
+LEVEL_SPEEDS = tuple(
+    (int(PAC_SPEED_BASE * 256), int(PAC_SPEED_BASE * min(2.0, 1.0 + 0.1 * (lvl - 1)) * 256))
+    for lvl in range(1, 33)
+)
+
+def reset_ghost(state: Dict, i: int) -> None:
+    state["gx"][i], state["gy"][i] = cell_center(*GHOST_HOMES[i])
+    state["gdir"][i] = DIR_U
+    state["gfright"][i] = 0.0
+    state["g_acc"][i] = 0
+
 def reset_level(state: Dict) -> None:
     ps = pick_start_tile_pac()
     reachable = flood_reachable(ps)
     pellets, power = build_pellets(reachable)
     state["pellets"] = pellets
+    state["board"] = build_board(pellets)
     state["power"] = power
+    state["dots_left"] = pellets.count(1) + power.count(1)
 
     state["px"], state["py"] = cell_center(*ps)
-    state["dir"] = DIRS["L"]
-    state["want"] = DIRS["L"]
-    state["p_acc"] = 0.0
-
-    for name, _ in GHOSTS:
-        hx, hy = GHOST_HOME_TILES[name]
-        gx, gy = cell_center(hx, hy)
-        g = state["ghosts"][name]
-        g["x"], g["y"] = gx, gy
-        g["dir"] = DIRS["U"]
-        g["fright"] = 0.0
-        g["home"] = (hx, hy)
-        state["g_acc"][name] = 0.0
+    state["dir"] = DIR_L
+    state["want"] = DIR_L
+    state["p_acc"] = 0
+
+    for i in range(N_GHOSTS):
+        reset_ghost(state, i)
 
     state["menu"] = False
     state["menu_idx"] = 0
@@ -675,31 +989,30 @@ def reset_level(state: Dict) -> None:
     state["waiting"] = True  # READY until L/R
 
 def new_game(hiscore: int) -> Dict:
-    ghosts: Dict[str, Dict] = {}
-    for name, col in GHOSTS:
-        hx, hy = GHOST_HOME_TILES[name]
-        gx, gy = cell_center(hx, hy)
-        ghosts[name] = {"x": gx, "y": gy, "dir": DIRS["U"], "col": col, "fright": 0.0, "home": (hx, hy)}
-
     state = {
         "score": 0,
         "hiscore": hiscore,
         "lives": 3,
         "level": 1,
 
-        "pellets": set(),
-        "power": set(),
+        "pellets": bytearray(ROWS * COLS),
+        "power": bytearray(ROWS * COLS),
+        "dots_left": 0,
+        "board": None,  # MAZE_BG + pellets, set by reset_level
 
         "px": 0, "py": 0,
-        "dir": DIRS["L"],
-        "want": DIRS["L"],
+        "dir": DIR_L,
+        "want": DIR_L,
 
-        "ghosts": ghosts,
+        "gx": [0] * N_GHOSTS,
+        "gy": [0] * N_GHOSTS,
+        "gdir": [DIR_U] * N_GHOSTS,
+        "gfright": [0.0] * N_GHOSTS,
 
         "dead": False,
         "dead_t": 0.0,
 
-        "start_time": time.time(),
+        "start_time": time.monotonic(),
         "time_offset": 0.0,
 
         "mouth_open": True,
@@ -708,14 +1021,14 @@ def new_game(hiscore: int) -> Dict:
         "power_on": True,
         "power_timer": 0.0,
 
-        "p_acc": 0.0,
-        "g_acc": {name: 0.0 for name, _ in GHOSTS},
+        "p_acc": 0,  # Q8 sub-pixel accumulators
+        "g_acc": [0] * N_GHOSTS,
 
         "menu": False,
         "menu_idx": 0,
         "fright_chain": 0,
         "waiting": True,
-        "last_menu_toggle": 0.0,
+        "last_menu_toggle": -MENU_DEBOUNCE_SEC,
     }
     reset_level(state)
     return state
@@ -729,18 +1042,39 @@ def main():
     js = Joystick()
     js.start()
 
-    maze_img = Image.new("RGB", (W, H), BLACK)
-    draw_maze_visual(maze_img)
-
     pac_mask, ghost_mask = build_centerline_masks()
+    ghost_dirs = build_dir_masks(ghost_mask)
     frame = Image.new("RGB", (W, H), BLACK)
+    d = ImageDraw.Draw(frame)  # one drawing context for the persistent frame
+    shown_board = None  # board the frame was last fully painted from
+    dirty = set()       # sprite/overlay boxes drawn over that board last frame
+    shown_hud = None    # (score, hiscore, lives, tsec, level) currently drawn in the HUD
+    shown_scene = None  # (waiting, menu, dead, menu_idx) of the paused frame on the panel
 
     hiscore = load_hiscore()
     game = new_game(hiscore)
-
-    PAC_SPEED_BASE = 24.0
+    persisted_hiscore = hiscore  # value on disk; only write when beaten
+
+    threading.Thread(target=io_worker, daemon=True).start()
+
+    def persist_hiscore(sync: bool = False):
+        # sync (before exec/exit): flush queued writes first, then write inline
+        nonlocal persisted_hiscore
+        if sync:
+            IO_QUEUE.join()
+        v = game["hiscore"]
+        if v > persisted_hiscore:
+            persisted_hiscore = v
+            if sync:
+                save_hiscore(v)
+            else:
+                IO_QUEUE.put(lambda v=v: save_hiscore(v))
+
+    PAC_SPEED, GHOST_SPEED = LEVEL_SPEEDS[0]  # Q8 px/s
+    speed_level = 0  # level the speeds were looked up for
     dt = 0.02
-    last = time.time()
+    last = time.monotonic()
+    next_tick = last + dt  # fixed-step deadline, advanced by dt per tick
 
     MOUTH_PERIOD = 0.80
     POWER_BLINK_PERIOD = 1.30
@@ -750,78 +1084,74 @@ def main():
     def handle_exit(signum, frame_):
         nonlocal running
         running = False
+        js.wake()  # don't sit out the rest of the idle wait
     signal.signal(signal.SIGINT, handle_exit)
     signal.signal(signal.SIGTERM, handle_exit)
 
     try:
         while running:
             ev = js.pop()
-            now = time.time()
+            now = time.monotonic()  # one clock read per pass, shared below
 
             # MENU TOGGLE
-            raw_toggle = ev.start or ev.select or (MENU_TOGGLE_FALLBACK_Y and ev.y)
+            raw_toggle = ev & (EV_START | EV_SELECT | (EV_Y if MENU_TOGGLE_FALLBACK_Y else 0))
             if raw_toggle and (now - game["last_menu_toggle"] > MENU_DEBOUNCE_SEC):
                 game["last_menu_toggle"] = now
                 game["menu"] = not game["menu"]
                 if game["menu"]:
                     game["menu_idx"] = 0
 
+            # mode flags as locals for this pass; written back to game on change
+            waiting, menu, dead = game["waiting"], game["menu"], game["dead"]
+
             # WAITING TO START: only LEFT/RIGHT starts
-            if game["waiting"] and not game["menu"] and not game["dead"]:
-                if ev.left:
-                    game["waiting"] = False
-                    game["want"] = DIRS["L"]
-                    game["dir"]  = DIRS["L"]
-                elif ev.right:
-                    game["waiting"] = False
-                    game["want"] = DIRS["R"]
-                    game["dir"]  = DIRS["R"]
+            if waiting and not menu and not dead:
+                lr = ev & (EV_LEFT | EV_RIGHT)
+                if lr:
+                    game["waiting"] = waiting = False
+                    game["want"] = game["dir"] = (lr & -lr).bit_length() - 1  # LEFT wins
 
             # MENU
-            if game["menu"]:
-                if ev.up:
-                    game["menu_idx"] = (game["menu_idx"] - 1) % len(MENU_ITEMS)
-                if ev.down:
-                    game["menu_idx"] = (game["menu_idx"] + 1) % len(MENU_ITEMS)
-                if ev.b or ev.y:
-                    game["menu"] = False
-                if ev.a or ev.x:
+            if menu:
+                delta = ((ev & EV_DOWN) != 0) - ((ev & EV_UP) != 0)
+                if delta:
+                    game["menu_idx"] = (game["menu_idx"] + delta) % len(MENU_ITEMS)
+                if ev & (EV_B | EV_Y):
+                    game["menu"] = menu = False
+                if ev & (EV_A | EV_X):
                     choice = MENU_ITEMS[game["menu_idx"]]
                     if choice == "RESUME":
-                        game["menu"] = False
+                        game["menu"] = menu = False
                     elif choice == "RESTART":
-                        if game["score"] > game["hiscore"]:
-                            game["hiscore"] = game["score"]
-                            save_hiscore(game["hiscore"])
+                        persist_hiscore()
                         game = new_game(game["hiscore"])
+                        waiting, menu, dead = game["waiting"], game["menu"], game["dead"]
                     elif choice == "EXIT":
-                        if game["score"] > game["hiscore"]:
-                            game["hiscore"] = game["score"]
-                            save_hiscore(game["hiscore"])
+                        persist_hiscore(sync=True)
                         exec_launcher_or_exit(matrix)
 
+            paused = waiting or menu or dead
+
             # DPAD intent only if playing
-            if (not game["waiting"]) and (not game["menu"]) and (not game["dead"]):
-                if ev.left:  game["want"] = DIRS["L"]
-                if ev.right: game["want"] = DIRS["R"]
-                if ev.up:    game["want"] = DIRS["U"]
-                if ev.down:  game["want"] = DIRS["D"]
-
-            # timing
-            now = time.time()
-            if now - last < dt:
-                time.sleep(0.001)
+            dpad = ev & EV_DPAD
+            if dpad and not paused:
+                game["want"] = dpad.bit_length() - 1  # highest bit wins: DOWN > UP > RIGHT > LEFT
+
+            # timing: sleep until the next tick or new input, whichever comes first
+            if now < next_tick:
+                js.wait(next_tick - now)
                 continue
+            next_tick += dt
+            if next_tick <= now:
+                next_tick = now + dt  # fell behind (stall): resync instead of bursting
             elapsed = now - last
             last = now
 
-            paused = game["waiting"] or game["menu"] or game["dead"]
-
             if paused:
                 game["time_offset"] += elapsed
 
             # death handling
-            if game["dead"]:
+            if dead:
                 game["dead_t"] += elapsed
                 if game["dead_t"] >= 1.0:
                     game["dead_t"] = 0.0
@@ -829,23 +1159,17 @@ def main():
                     game["lives"] -= 1
 
                     if game["lives"] <= 0:
-                        if game["score"] > game["hiscore"]:
-                            game["hiscore"] = game["score"]
-                            save_hiscore(game["hiscore"])
+                        persist_hiscore()
                         game = new_game(game["hiscore"])
                     else:
                         ps = pick_start_tile_pac()
                         game["px"], game["py"] = cell_center(*ps)
-                        game["dir"] = DIRS["L"]
-                        game["want"] = DIRS["L"]
-                        game["p_acc"] = 0.0
+                        game["dir"] = DIR_L
+                        game["want"] = DIR_L
+                        game["p_acc"] = 0
 
-                        for name, gg in game["ghosts"].items():
-                            hx, hy = gg["home"]
-                            gg["x"], gg["y"] = cell_center(hx, hy)
-                            gg["dir"] = DIRS["U"]
-                            gg["fright"] = 0.0
-                            game["g_acc"][name] = 0.0
+                        for i in range(N_GHOSTS):
+                            reset_ghost(game, i)
 
                         game["fright_chain"] = 0
                         game["waiting"] = True
@@ -862,83 +1186,66 @@ def main():
                     game["power_timer"] -= POWER_BLINK_PERIOD
                     game["power_on"] = not game["power_on"]
 
-            # speed per level: ghosts +10% per level up to +100% (2x)
-            lvl = game["level"]
-            ghost_factor = min(2.0, 1.0 + 0.1 * (lvl - 1))
-            PAC_SPEED = PAC_SPEED_BASE
-            GHOST_SPEED = PAC_SPEED_BASE * ghost_factor
-
             # gameplay
             if not paused:
-                wx, wy = game["want"]
-                if can_stand(pac_mask, game["px"] + wx, game["py"] + wy):
-                    game["dir"] = game["want"]
-
-                game["p_acc"] += PAC_SPEED * elapsed
-                while game["p_acc"] >= 1.0:
-                    game["p_acc"] -= 1.0
-                    dx, dy = game["dir"]
-                    if dx != 0:
-                        game["px"], game["py"] = tunnel_wrap_on_centerline(game["px"], game["py"], dx)
-                    nx, ny = game["px"] + dx, game["py"] + dy
-                    if can_stand(pac_mask, nx, ny):
-                        game["px"], game["py"] = nx, ny
-
-                cx, cy = px_to_cell(game["px"], game["py"])
-                txc, tyc = cell_center(cx, cy)
-                if game["px"] == txc and game["py"] == tyc:
-                    if (cx, cy) in game["pellets"]:
-                        game["pellets"].remove((cx, cy))
+                # speed per level: ghosts +10% per level up to +100% (2x); only on level change
+                if game["level"] != speed_level:
+                    speed_level = game["level"]
+                    PAC_SPEED, GHOST_SPEED = LEVEL_SPEEDS[min(speed_level, len(LEVEL_SPEEDS)) - 1]
+
+                want = game["want"]
+                if can_stand(pac_mask, game["px"] + DX[want], game["py"] + DY[want]):
+                    game["dir"] = want
+
+                game["px"], game["py"], game["p_acc"] = move_along(
+                    pac_mask, game["px"], game["py"], game["dir"],
+                    game["p_acc"] + round(PAC_SPEED * elapsed), True)
+
+                px, py = game["px"] - OX, game["py"] - OY
+                if px % CELL_X == CELL_HALF_X and py % CELL_Y == CELL_HALF_Y:
+                    ti = (py // CELL_Y) * COLS + px // CELL_X
+                    if game["pellets"][ti]:
+                        game["pellets"][ti] = 0
+                        erase_pellet(game["board"], ti)
+                        game["dots_left"] -= 1
                         game["score"] += 10
-                    if (cx, cy) in game["power"]:
-                        game["power"].remove((cx, cy))
+                    if game["power"][ti]:
+                        game["power"][ti] = 0
+                        game["dots_left"] -= 1
                         game["score"] += 50
-                        for gg in game["ghosts"].values():
-                            gg["fright"] = FRIGHT_DURATION
+                        game["gfright"][:] = [FRIGHT_DURATION] * N_GHOSTS
                         game["fright_chain"] = 0
 
-                for gg in game["ghosts"].values():
-                    if gg["fright"] > 0.0:
-                        gg["fright"] = max(0.0, gg["fright"] - elapsed)
+                gxs, gys, gdirs = game["gx"], game["gy"], game["gdir"]
+                gfright, g_acc = game["gfright"], game["g_acc"]
+                g_step = round(GHOST_SPEED * elapsed)  # Q8 pixels this tick
 
-                pac_px = (game["px"], game["py"])
+                for i in range(N_GHOSTS):
+                    if gfright[i] > 0.0:
+                        gfright[i] = max(0.0, gfright[i] - elapsed)
 
-                for name, g in game["ghosts"].items():
-                    frightened = g["fright"] > 0.0
-                    gx, gy = g["x"], g["y"]
+                for i in range(N_GHOSTS):
+                    frightened = gfright[i] > 0.0
+                    gx, gy = gxs[i], gys[i]
 
-                    if is_at_tile_center(gx, gy):
-                        gcx, gcy = px_to_cell(gx, gy)
-                        if in_house(gcx, gcy) and not frightened:
+                    if (gx - OX) % CELL_X == CELL_HALF_X and (gy - OY) % CELL_Y == CELL_HALF_Y:
+                        if HOUSE_BITS[(gy - OY) // CELL_Y * COLS + (gx - OX) // CELL_X] and not frightened:
                             if can_stand(ghost_mask, gx, gy - 1):
-                                g["dir"] = DIRS["U"]
+                                gdirs[i] = DIR_U
                             else:
-                                ex, ey = cell_center(*HOUSE_EXIT_TILE)
-                                g["dir"] = ghost_choose_dir(gx, gy, g["dir"], (ex, ey), False, ghost_mask)
-                        else:
-                            g["dir"] = ghost_choose_dir(gx, gy, g["dir"], pac_px, frightened, ghost_mask)
-
-                    game["g_acc"][name] += GHOST_SPEED * elapsed
-                    while game["g_acc"][name] >= 1.0:
-                        game["g_acc"][name] -= 1.0
-                        ddx, ddy = g["dir"]
-                        if ddx != 0:
-                            g["x"], g["y"] = tunnel_wrap_on_centerline(g["x"], g["y"], ddx)
-                        nx, ny = g["x"] + ddx, g["y"] + ddy
-                        if can_stand(ghost_mask, nx, ny):
-                            g["x"], g["y"] = nx, ny
+                                gdirs[i] = ghost_choose_dir(gx, gy, gdirs[i], HOUSE_EXIT_X, HOUSE_EXIT_Y, False, ghost_dirs)
                         else:
-                            break
+                            gdirs[i] = ghost_choose_dir(gx, gy, gdirs[i], game["px"], game["py"], frightened, ghost_dirs)
+
+                    gx, gy, g_acc[i] = move_along(
+                        ghost_mask, gx, gy, gdirs[i], g_acc[i] + g_step, False)
+                    gxs[i], gys[i] = gx, gy
 
-                    if collide(game["px"], game["py"], g["x"], g["y"], r=1):
+                    if collide(game["px"], game["py"], gx, gy, r=1):
                         if frightened:
                             game["fright_chain"] += 1
-                            game["score"] += 200 * (2 ** max(0, game["fright_chain"] - 1))
-                            hx, hy = g["home"]
-                            g["x"], g["y"] = cell_center(hx, hy)
-                            g["dir"] = DIRS["U"]
-                            g["fright"] = 0.0
-                            game["g_acc"][name] = 0.0
+                            game["score"] += FRIGHT_SCORES[min(game["fright_chain"], N_GHOSTS) - 1]
+                            reset_ghost(game, i)
                         else:
                             game["dead"] = True
                             game["dead_t"] = 0.0
@@ -948,43 +1255,73 @@ def main():
                     game["hiscore"] = game["score"]
 
                 # NEXT LEVEL (FIX): lives reset to 3, do NOT force level=3
-                if len(game["pellets"]) == 0 and len(game["power"]) == 0:
+                if game["dots_left"] == 0:
                     game["level"] += 1
                     game["lives"] = 3
                     reset_level(game)
 
-            tsec = int((time.time() - game["start_time"]) - game["time_offset"])
-
-            # render
-            d = ImageDraw.Draw(frame)
-            frame.paste(maze_img, (0, 0))
+            tsec = int((now - game["start_time"]) - game["time_offset"])
+
+            # render: frame keeps the last image, so only the boxes drawn over
+            # the board last time are restored (full paste when the board changes)
+            board = game["board"]
+
+            # paused scenes are frozen (no movement or animation): after one render,
+            # leave the panel alone until the overlay, menu cursor or board changes
+            if game["waiting"] or game["menu"] or game["dead"]:
+                scene = (game["waiting"], game["menu"], game["dead"], game["menu_idx"])
+                if scene == shown_scene and board is shown_board:
+                    continue
+                shown_scene = scene
+            else:
+                shown_scene = None
+
+            if board is not shown_board:
+                frame.paste(board, (0, 0))
+                shown_board = board
+                shown_hud = None
+            else:
+                for tile, r in STATIC_BG:
+                    frame.paste(tile, r)
+                for r in dirty:
+                    frame.paste(board.crop(r), r)
+            dirty = set()  # stacked ghosts share a box: restore it once
 
-            draw_pellets_img(d, game["pellets"])
             draw_power_img(d, game["power"], game["power_on"])
 
-            draw_pacman(d, game["px"], game["py"], game["mouth_open"], game["dir"])
-            for g in game["ghosts"].values():
-                draw_ghost(d, g["x"], g["y"], g["col"], g["fright"] > 0.0)
+            draw_pacman(frame, game["px"], game["py"], game["mouth_open"], game["dir"])
+            dirty.add(sprite_box(game["px"], game["py"]))
+            for i in range(N_GHOSTS):
+                draw_ghost(frame, game["gx"][i], game["gy"][i], i, game["gfright"][i] > 0.0)
+                dirty.add(sprite_box(game["gx"][i], game["gy"][i]))
 
-            draw_hud(d, game["score"], game["hiscore"], game["lives"], tsec, game["level"])
+            # nothing else draws over the HUD panel: repaint it only when a field changes
+            hud = (game["score"], game["hiscore"], game["lives"], tsec, game["level"])
+            if hud != shown_hud:
+                frame.paste(HUD_BG_TILE, HUD_BOX)
+                draw_hud(d, game["score"], game["hiscore"], game["lives"], tsec, game["level"])
+                shown_hud = hud
 
             if game["waiting"] and not game["menu"]:
-                d.rectangle((30, 26, 98, 38), fill=BLACK, outline=DIM)
+                d.rectangle(READY_BOX, fill=BLACK, outline=DIM)
                 draw_text_3x5(d, 34, 29, "READY", TXT)
+                dirty.add(READY_RESTORE)
 
             if game["menu"]:
                 draw_menu_overlay(d, game["menu_idx"])
+                dirty.add(MENU_RESTORE)
 
             if game["dead"]:
-                d.rectangle((28, 26, 100, 38), fill=BLACK, outline=DIM)
+                d.rectangle(OUCH_BOX, fill=BLACK, outline=DIM)
                 draw_text_3x5(d, 38, 29, "OUCH", TXT)
+                dirty.add(OUCH_RESTORE)
 
             off.SetImage(frame, 0, 0)
             off = matrix.SwapOnVSync(off)
 
     finally:
         try:
-            save_hiscore(game["hiscore"])
+            persist_hiscore(sync=True)
         except Exception:
             pass
         js.stop()
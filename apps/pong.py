@@ -15,9 +15,10 @@ import time
 import math
 import random
 import struct
+import selectors
 import threading
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -41,6 +42,7 @@ PADDLE_SPEED = 120.0  # px/s
 BALL_SPEED_START = 120.0
 BALL_SPEED_MAX = 150.0
 BALL_VY_MAX = 220.0
+BALL_SPEED_MAX_SQ = BALL_SPEED_MAX * BALL_SPEED_MAX
 SPIN_P1 = 110.0
 
 # ===== DIFFICULTY =====
@@ -65,6 +67,10 @@ BTN_Y = 3
 BTN_SELECT = 8
 BTN_START = 9
 
+JS_EVENT = struct.Struct("IhBB")  # time, value, type, number
+# button number -> Controls field set on press
+BTN_FIELDS = {BTN_START: "start", BTN_SELECT: "select", BTN_A: "a", BTN_B: "b", BTN_X: "x", BTN_Y: "y"}
+
 # ===== COLORS =====
 BG = (0, 0, 0)
 FG = (240, 240, 240)
@@ -127,7 +133,17 @@ def text_h(d: ImageDraw.ImageDraw, text: str, font) -> int:
     bb = d.textbbox((0, 0), text, font=font)
     return int(bb[3] - bb[1])
 
+# (text, id(font), max_w) -> fitted text; menu lines are a handful of fixed strings
+_FITTED: Dict[Tuple[str, int, int], str] = {}
+
 def truncate_to_fit(d: ImageDraw.ImageDraw, s: str, font, max_w: int) -> str:
+    key = (s, id(font), max_w)
+    t = _FITTED.get(key)
+    if t is None:
+        t = _FITTED[key] = _truncate_to_fit(d, s, font, max_w)
+    return t
+
+def _truncate_to_fit(d: ImageDraw.ImageDraw, s: str, font, max_w: int) -> str:
     if text_w(d, s, font) <= max_w:
         return s
     ell = "…"
@@ -143,20 +159,38 @@ def truncate_to_fit(d: ImageDraw.ImageDraw, s: str, font, max_w: int) -> str:
             hi = mid
     return s[:max(0, lo - 1)].rstrip() + ell
 
+# (text, id(font), threshold) -> (mask, bbox left, bbox top); LRU by insertion order
+_TEXT_MASKS: Dict[Tuple[str, int, int], Tuple[Image.Image, int, int]] = {}
+TEXT_MASK_CACHE_MAX = 64
+
+def _text_mask(text: str, font, threshold: int) -> Optional[Tuple[Image.Image, int, int]]:
+    key = (text, id(font), threshold)
+    m = _TEXT_MASKS.pop(key, None)
+    if m is None:
+        # mask only as big as the text (not the whole screen), thresholded once
+        l, t, r, b = font.getbbox(text)
+        if r <= l or b <= t:
+            return None
+        mask = Image.new("L", (r - l, b - t), 0)
+        md = ImageDraw.Draw(mask)
+        md.text((-l, -t), text, font=font, fill=255)
+        mask = mask.point(lambda p: 255 if p >= threshold else 0)
+        m = (mask, l, t)
+        if len(_TEXT_MASKS) >= TEXT_MASK_CACHE_MAX:
+            _TEXT_MASKS.pop(next(iter(_TEXT_MASKS)))
+    _TEXT_MASKS[key] = m
+    return m
+
 def draw_text_crisp(img_rgb: Image.Image, pos, text: str, font, fill=FG, threshold: int = 80):
     if not text:
         return
     x, y = pos
-    mask = Image.new("L", (W, H), 0)
-    md = ImageDraw.Draw(mask)
-    md.text((x, y), text, font=font, fill=255)
-    mask = mask.point(lambda p: 255 if p >= threshold else 0)
-
-    layer = Image.new("RGB", (W, H), (0, 0, 0))
-    ld = ImageDraw.Draw(layer)
-    ld.rectangle((0, 0, W, H), fill=fill)
-
-    img_rgb.paste(layer, (0, 0), mask)
+    m = _text_mask(text, font, threshold)
+    if m is None:
+        return
+    # solid colour straight through the cached mask, no full-screen layer/mask
+    mask, l, t = m
+    img_rgb.paste(fill, (x + l, y + t, x + l + mask.width, y + t + mask.height), mask)
 
 def draw_centered_crisp(img_rgb: Image.Image, y: int, text: str, font, fill=FG):
     d = ImageDraw.Draw(img_rgb)
@@ -165,10 +199,10 @@ def draw_centered_crisp(img_rgb: Image.Image, y: int, text: str, font, fill=FG):
     draw_text_crisp(img_rgb, (x, y), text, font, fill=fill)
 
 def dim_overlay(img_rgb: Image.Image, alpha: int = 155):
-    overlay = Image.new("RGBA", (W, H), (0, 0, 0, alpha))
-    base = img_rgb.convert("RGBA")
-    base.alpha_composite(overlay)
-    img_rgb.paste(base.convert("RGB"))
+    # opaque black at alpha == scaling every channel by (255-alpha)/255 -> one LUT pass
+    k = 255 - alpha
+    lut = [(p * k + 127) // 255 for p in range(256)]
+    img_rgb.paste(img_rgb.point(lut * 3))
 
 # ===== RETURN TO LAUNCHER =====
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -255,85 +289,107 @@ class Js0Reader(threading.Thread):
 
             return held, edges
 
-    def _push_btn(self, **kwargs):
+    def _handle(self, value: int, etype: int, num: int):
+        # caller holds self._lock
+        if (etype & 0x80) != 0:
+            return
+        et = etype & 0x7F
+
+        if et == 0x02:  # axis
+            # -1 / 0 / +1 with deadzone; only a change of held state does any work
+            new = (value > DEADZONE) - (value < -DEADZONE)
+            if num == AXIS_X:
+                if new != self._held_x:
+                    self._held_x = new
+                    if new == -1:
+                        self._edge_left = True
+                    elif new == +1:
+                        self._edge_right = True
+
+            elif num == AXIS_Y:
+                if new != self._held_y:
+                    self._held_y = new
+                    if new == -1:
+                        self._edge_up = True
+                    elif new == +1:
+                        self._edge_down = True
+
+        elif et == 0x01 and value == 1:  # button press
+            name = BTN_FIELDS.get(num)
+            if name is not None:
+                setattr(self._btn, name, True)
+
+    def _handle_batch(self, data):
+        # whole events only; parse in one C loop, take the lock once per burst
+        handle = self._handle
         with self._lock:
-            for k, v in kwargs.items():
-                setattr(self._btn, k, getattr(self._btn, k) or v)
+            for _t, value, etype, num in JS_EVENT.iter_unpack(data):
+                handle(value, etype, num)
 
     def run(self):
         if not os.path.exists(self.js_path):
             print("No joystick:", self.js_path)
             return
 
-        fmt = "IhBB"
-        sz = struct.calcsize(fmt)
-
         try:
-            with open(self.js_path, "rb", buffering=0) as f:
-                while not self._stop:
-                    data = f.read(sz)
-                    if not data or len(data) != sz:
-                        time.sleep(0.005)
-                        continue
-
-                    _t, value, etype, num = struct.unpack(fmt, data)
-                    if (etype & 0x80) != 0:
-                        continue
-                    et = etype & 0x7F
-
-                    if et == 0x02:  # axis
-                        v = int(value)
-
-                        if num == AXIS_X:
-                            new = 0
-                            if v < -DEADZONE:
-                                new = -1
-                            elif v > DEADZONE:
-                                new = +1
-                            with self._lock:
-                                if new != self._held_x:
-                                    self._held_x = new
-                                    if new == -1:
-                                        self._edge_left = True
-                                    elif new == +1:
-                                        self._edge_right = True
-
-                        elif num == AXIS_Y:
-                            new = 0
-                            if v < -DEADZONE:
-                                new = -1
-                            elif v > DEADZONE:
-                                new = +1
-                            with self._lock:
-                                if new != self._held_y:
-                                    self._held_y = new
-                                    if new == -1:
-                                        self._edge_up = True
-                                    elif new == +1:
-                                        self._edge_down = True
-
-                    elif et == 0x01 and value == 1:  # button press
-                        if num == BTN_START:
-                            self._push_btn(start=True)
-                        elif num == BTN_SELECT:
-                            self._push_btn(select=True)
-                        elif num == BTN_A:
-                            self._push_btn(a=True)
-                        elif num == BTN_B:
-                            self._push_btn(b=True)
-                        elif num == BTN_X:
-                            self._push_btn(x=True)
-                        elif num == BTN_Y:
-                            self._push_btn(y=True)
+            fd = os.open(self.js_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError as e:
+            print("JoystickReader error:", e)
+            return
+        sel = selectors.DefaultSelector()
+        sel.register(fd, selectors.EVENT_READ)
+        sz = JS_EVENT.size
+        buf = bytearray(sz * 16)  # reused; one read drains a burst of events
+        mv = memoryview(buf)
 
+        try:
+            while not self._stop:
+                # sleep in the kernel until js0 has data (timeout only to notice stop())
+                if not sel.select(timeout=0.1):
+                    continue
+                while True:
+                    try:
+                        n = os.readv(fd, [buf])
+                    except BlockingIOError:
+                        break
+                    if n <= 0:
+                        return  # device gone
+                    self._handle_batch(mv[:n - n % sz])
         except Exception as e:
             print("JoystickReader error:", e)
+        finally:
+            sel.close()
+            os.close(fd)
 
 # ===== DRAW HELPERS =====
 def draw_center_line(d: ImageDraw.ImageDraw):
     for y in range(0, H, 6):
         d.rectangle((W // 2 - 1, y, W // 2, y + 2), fill=(40, 40, 40))
 
+def build_court() -> Image.Image:
+    """Static background (BG + dashed center line), pasted once per frame."""
+    img = Image.new("RGB", (W, H), BG)
+    draw_center_line(ImageDraw.Draw(img))
+    return img
+
+COURT = build_court()
+
+BALL_COLOR = (255, 255, 255)
+
+def build_ball_mask() -> Image.Image:
+    """The 5x5 disk d.ellipse draws for the ball, rasterized once as a 1-bit stamp."""
+    m = Image.new("1", (2 * BALL_R + 1, 2 * BALL_R + 1), 0)
+    ImageDraw.Draw(m).ellipse((0, 0, 2 * BALL_R, 2 * BALL_R), fill=1)
+    return m
+
+BALL_MASK = build_ball_mask()
+
+def draw_ball(img: Image.Image, d: ImageDraw.ImageDraw, box):
+    if box[2] - box[0] == 2 * BALL_R and box[3] - box[1] == 2 * BALL_R:
+        img.paste(BALL_COLOR, box[:2], BALL_MASK)  # paste clips at the screen edge
+    else:
+        d.ellipse(box, fill=BALL_COLOR)  # int() truncation squeezed the box (x < 0 after a miss)
+
 def reset_ball():
     x = W / 2.0
     y = H / 2.0
@@ -441,18 +497,24 @@ def main():
     d = ImageDraw.Draw(img)
 
     overlay = Overlay(font_score)
+    shown_scene = None  # render inputs of the frame last sent to the matrix
 
     # timing
     target_fps = 60.0
     frame_dt = 1.0 / target_fps
     last = time.perf_counter()
+    next_t = last  # frame deadline, advanced by frame_dt
 
     # start menu debounce
     MENU_DEBOUNCE = 0.28
     last_menu_toggle = 0.0
 
     def apply_diff():
-        return DIFF_PARAMS[DIFFS[diff_i]]
+        p = DIFF_PARAMS[DIFFS[diff_i]]
+        return p["AI_STRENGTH"], p["AI_REACTION_S"], p["AI_DEADZONE"], p["AI_MAX_SPEED_MULT"], p["SPIN_P2"]
+
+    # difficulty params: looked up only when diff_i changes
+    AI_STRENGTH, AI_REACTION_S, AI_DEADZONE, AI_MAX_SPEED_MULT, SPIN_P2 = apply_diff()
 
     def begin_round():
         nonlocal paused, ball_x, ball_y, ball_vx, ball_vy
@@ -493,11 +555,9 @@ def main():
                 elif down_edge:
                     menu_idx = (menu_idx + 1) % len(MENU_ITEMS)
 
-                if MENU_ITEMS[menu_idx] == "DIFFICULTY":
-                    if left_edge:
-                        diff_i = (diff_i - 1) % len(DIFFS)
-                    elif right_edge:
-                        diff_i = (diff_i + 1) % len(DIFFS)
+                if MENU_ITEMS[menu_idx] == "DIFFICULTY" and (left_edge or right_edge):
+                    diff_i = (diff_i + (-1 if left_edge else 1)) % len(DIFFS)
+                    AI_STRENGTH, AI_REACTION_S, AI_DEADZONE, AI_MAX_SPEED_MULT, SPIN_P2 = apply_diff()
 
                 if held.a or held.x:
                     choice = MENU_ITEMS[menu_idx]
@@ -518,16 +578,10 @@ def main():
                 if start_armed and (up_edge or down_edge):
                     begin_round()
 
-            # difficulty params
-            params = apply_diff()
-            AI_STRENGTH = params["AI_STRENGTH"]
-            AI_REACTION_S = params["AI_REACTION_S"]
-            AI_DEADZONE = params["AI_DEADZONE"]
-            AI_MAX_SPEED_MULT = params["AI_MAX_SPEED_MULT"]
-            SPIN_P2 = params["SPIN_P2"]
+            live = (not paused) and (not menu)  # ball/paddles/AI advance this frame
 
             # P1 movement
-            if (not paused) and (not menu):
+            if live:
                 if held.up and not held.down:
                     p1_y -= PADDLE_SPEED * dt
                 elif held.down and not held.up:
@@ -535,7 +589,7 @@ def main():
             p1_y = clamp(p1_y, 0.0, H - PADDLE_H)
 
             # AI movement
-            if (not paused) and (not menu):
+            if live:
                 t = time.time()
                 if t - ai_last_react >= AI_REACTION_S:
                     ai_last_react = t
@@ -548,7 +602,7 @@ def main():
             p2_y = clamp(p2_y, 0.0, H - PADDLE_H)
 
             # Ball
-            if (not paused) and (not menu):
+            if live:
                 ball_x += ball_vx * dt
                 ball_y += ball_vy * dt
 
@@ -576,11 +630,13 @@ def main():
                         rel = (ball_y - (p2_y + PADDLE_H / 2)) / (PADDLE_H / 2)
                         ball_vy += rel * SPIN_P2
 
-                ball_vy = clamp(ball_vy, -BALL_VY_MAX, BALL_VY_MAX)
-
-                sp = math.hypot(ball_vx, ball_vy)
-                if sp > BALL_SPEED_MAX:
-                    scale = BALL_SPEED_MAX / max(sp, 1e-6)
+                # vy clamp + speed cap; the squared test skips hypot on uncapped frames
+                if ball_vy > BALL_VY_MAX:
+                    ball_vy = BALL_VY_MAX
+                elif ball_vy < -BALL_VY_MAX:
+                    ball_vy = -BALL_VY_MAX
+                if ball_vx * ball_vx + ball_vy * ball_vy > BALL_SPEED_MAX_SQ:
+                    scale = BALL_SPEED_MAX / math.hypot(ball_vx, ball_vy)
                     ball_vx *= scale
                     ball_vy *= scale
 
@@ -602,37 +658,46 @@ def main():
                     score1 = score2 = 0
                     pause_round()
 
-            # RENDER
-            d.rectangle((0, 0, W, H), fill=BG)
-            draw_center_line(d)
+            # RENDER: only when something the frame shows has changed
+            # (paused/menu screens stay static for seconds at a time)
+            ball_box = (int(ball_x - BALL_R), int(ball_y - BALL_R), int(ball_x + BALL_R), int(ball_y + BALL_R))
+            ov_active = overlay.active()
+            scene = (int(p1_y), int(p2_y), ball_box, score1, score2, paused,
+                     overlay.msg if ov_active else "", menu, menu_idx, diff_i)
+            if scene != shown_scene:
+                shown_scene = scene
 
-            # paddles
-            d.rectangle((P1_X, int(p1_y), P1_X + PADDLE_W, int(p1_y) + PADDLE_H), fill=(200, 200, 200))
-            d.rectangle((P2_X, int(p2_y), P2_X + PADDLE_W, int(p2_y) + PADDLE_H), fill=(200, 200, 200))
+                img.paste(COURT)
 
-            # ball
-            d.ellipse((int(ball_x - BALL_R), int(ball_y - BALL_R), int(ball_x + BALL_R), int(ball_y + BALL_R)), fill=(255, 255, 255))
+                # paddles
+                d.rectangle((P1_X, int(p1_y), P1_X + PADDLE_W, int(p1_y) + PADDLE_H), fill=(200, 200, 200))
+                d.rectangle((P2_X, int(p2_y), P2_X + PADDLE_W, int(p2_y) + PADDLE_H), fill=(200, 200, 200))
 
-            # score
-            draw_text_crisp(img, (W // 2 - 22, 2), str(score1), font_score, fill=DIM, threshold=85)
-            draw_text_crisp(img, (W // 2 + 14, 2), str(score2), font_score, fill=DIM, threshold=85)
+                # ball
+                draw_ball(img, d, ball_box)
 
-            if paused and (not overlay.active()) and (not menu):
-                draw_centered_crisp(img, H - 14, "UP/DOWN TO PLAY", font_hint, fill=ACC)
+                # score
+                draw_text_crisp(img, (W // 2 - 22, 2), str(score1), font_score, fill=DIM, threshold=85)
+                draw_text_crisp(img, (W // 2 + 14, 2), str(score2), font_score, fill=DIM, threshold=85)
 
-            overlay.draw(img)
+                if paused and (not ov_active) and (not menu):
+                    draw_centered_crisp(img, H - 14, "UP/DOWN TO PLAY", font_hint, fill=ACC)
 
-            if menu:
-                dim_overlay(img, alpha=155)
-                draw_menu(img, menu_idx, DIFFS[diff_i], font_menu)
+                overlay.draw(img)
+
+                if menu:
+                    dim_overlay(img, alpha=155)
+                    draw_menu(img, menu_idx, DIFFS[diff_i], font_menu)
 
-            matrix.SetImage(img, 0, 0)
+                matrix.SetImage(img, 0, 0)
 
-            # frame pacing
-            work = time.perf_counter() - now
-            sleep_for = frame_dt - work
-            if sleep_for > 0:
-                time.sleep(sleep_for)
+            # fixed 60 FPS deadline: render time is absorbed, oversleep doesn't accumulate
+            next_t += frame_dt
+            slack = next_t - time.perf_counter()
+            if slack > 0:
+                time.sleep(slack)
+            else:
+                next_t = time.perf_counter()  # overrun -> resync, no catch-up burst
 
     finally:
         js.stop()
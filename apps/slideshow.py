@@ -25,9 +25,10 @@ import sys
 import time
 import glob
 import struct
+import selectors
 import threading
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 from rgbmatrix import RGBMatrix, RGBMatrixOptions
@@ -50,6 +51,10 @@ BTN_Y = 3
 BTN_SELECT = 8
 BTN_START  = 9
 
+JS_EVENT = struct.Struct("IhBB")  # time, value, type, number
+# button number -> Controls field set on press
+BTN_FIELDS = {BTN_START: "start", BTN_SELECT: "select", BTN_A: "a", BTN_B: "b", BTN_X: "x", BTN_Y: "y"}
+
 # ===== FOLDERS =====
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 LOCAL_PHOTO_DIR = os.path.join(SCRIPT_DIR, "photos")
@@ -141,26 +146,44 @@ def text_width(d: ImageDraw.ImageDraw, text: str, font) -> int:
         bbox = d.textbbox((0, 0), text, font=font)
         return int(bbox[2] - bbox[0])
 
+# (text, id(font), threshold) -> (mask, bbox left, bbox top); LRU by insertion order
+_TEXT_MASKS: Dict[Tuple[str, int, int], Tuple[Image.Image, int, int]] = {}
+TEXT_MASK_CACHE_MAX = 64
+
+def _text_mask(text: str, font, threshold: int) -> Optional[Tuple[Image.Image, int, int]]:
+    key = (text, id(font), threshold)
+    m = _TEXT_MASKS.pop(key, None)
+    if m is None:
+        # mask only as big as the text (not the whole screen), thresholded once
+        l, t, r, b = font.getbbox(text)
+        if r <= l or b <= t:
+            return None
+        mask = Image.new("L", (r - l, b - t), 0)
+        md = ImageDraw.Draw(mask)
+        md.text((-l, -t), text, font=font, fill=255)
+        mask = mask.point(lambda p: 255 if p >= threshold else 0)
+        m = (mask, l, t)
+        if len(_TEXT_MASKS) >= TEXT_MASK_CACHE_MAX:
+            _TEXT_MASKS.pop(next(iter(_TEXT_MASKS)))
+    _TEXT_MASKS[key] = m
+    return m
+
 def draw_text_crisp(img_rgb: Image.Image, pos, text: str, font, fill=(255, 255, 255), threshold: int = 80):
     if not text:
         return
     x, y = pos
-    mask = Image.new("L", (W, H), 0)
-    md = ImageDraw.Draw(mask)
-    md.text((x, y), text, font=font, fill=255)
-    mask = mask.point(lambda p: 255 if p >= threshold else 0)
-
-    layer = Image.new("RGB", (W, H), (0, 0, 0))
-    ld = ImageDraw.Draw(layer)
-    ld.rectangle((0, 0, W, H), fill=fill)
-
-    img_rgb.paste(layer, (0, 0), mask)
+    m = _text_mask(text, font, threshold)
+    if m is None:
+        return
+    # solid colour straight through the cached mask, no full-screen layer/mask
+    mask, l, t = m
+    img_rgb.paste(fill, (x + l, y + t, x + l + mask.width, y + t + mask.height), mask)
 
 def dim_overlay(img_rgb: Image.Image, alpha: int = 155):
-    overlay = Image.new("RGBA", (W, H), (0, 0, 0, alpha))
-    base = img_rgb.convert("RGBA")
-    base.alpha_composite(overlay)
-    img_rgb.paste(base.convert("RGB"))
+    # opaque black at alpha == scaling every channel by (255-alpha)/255 -> one LUT pass
+    k = 255 - alpha
+    lut = [(p * k + 127) // 255 for p in range(256)]
+    img_rgb.paste(img_rgb.point(lut * 3))
 
 
 # =========================
@@ -242,56 +265,65 @@ class Js0Reader(threading.Thread):
 
             return e
 
-    def _push_btn(self, **kwargs):
+    def _handle(self, value: int, etype: int, num: int):
+        # caller holds self._lock
+        if (etype & 0x80) != 0:
+            return
+        et = etype & 0x7F
+
+        if et == 0x02:  # axis
+            self._last_axis_ts = time.time()
+            new = (value > DEADZONE) - (value < -DEADZONE)  # -1 / 0 / +1 with deadzone
+            if num == AXIS_X:
+                self._x_state = new
+            elif num == AXIS_Y:
+                self._y_state = new
+
+        elif et == 0x01 and value == 1:  # button press
+            name = BTN_FIELDS.get(num)
+            if name is not None:
+                setattr(self._ev, name, True)
+                self._ev.any = True
+
+    def _handle_batch(self, data):
+        # whole events only; parse in one C loop, take the lock once per burst
+        handle = self._handle
         with self._lock:
-            for k, v in kwargs.items():
-                setattr(self._ev, k, getattr(self._ev, k) or v)
-            self._ev.any = True
+            for _t, value, etype, num in JS_EVENT.iter_unpack(data):
+                handle(value, etype, num)
 
     def run(self):
         if not os.path.exists(self.js_path):
             return
 
-        fmt = "IhBB"
-        sz = struct.calcsize(fmt)
-
         try:
-            with open(self.js_path, "rb", buffering=0) as f:
-                while not self._stop:
-                    data = f.read(sz)
-                    if not data or len(data) != sz:
-                        time.sleep(0.005)
-                        continue
-
-                    _t, value, etype, num = struct.unpack(fmt, data)
-                    if (etype & 0x80) != 0:
-                        continue
-                    et = etype & 0x7F
-
-                    if et == 0x02:  # axis
-                        v = int(value)
-                        self._last_axis_ts = time.time()
-
-                        if num == AXIS_X:
-                            if v < -DEADZONE: self._x_state = -1
-                            elif v > DEADZONE: self._x_state = +1
-                            else: self._x_state = 0
-
-                        elif num == AXIS_Y:
-                            if v < -DEADZONE: self._y_state = -1
-                            elif v > DEADZONE: self._y_state = +1
-                            else: self._y_state = 0
-
-                    elif et == 0x01 and value == 1:  # button press
-                        if num == BTN_START: self._push_btn(start=True)
-                        elif num == BTN_SELECT: self._push_btn(select=True)
-                        elif num == BTN_A: self._push_btn(a=True)
-                        elif num == BTN_B: self._push_btn(b=True)
-                        elif num == BTN_X: self._push_btn(x=True)
-                        elif num == BTN_Y: self._push_btn(y=True)
+            fd = os.open(self.js_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            return
+        sel = selectors.DefaultSelector()
+        sel.register(fd, selectors.EVENT_READ)
+        sz = JS_EVENT.size
+        buf = bytearray(sz * 16)  # reused; one read drains a burst of events
+        mv = memoryview(buf)
 
+        try:
+            while not self._stop:
+                # sleep in the kernel until js0 has data (timeout only to notice stop())
+                if not sel.select(timeout=0.1):
+                    continue
+                while True:
+                    try:
+                        n = os.readv(fd, [buf])
+                    except BlockingIOError:
+                        break
+                    if n <= 0:
+                        return  # device gone
+                    self._handle_batch(mv[:n - n % sz])
         except Exception:
             return
+        finally:
+            sel.close()
+            os.close(fd)
 
 
 # =========================